@@ -0,0 +1,148 @@
+"""
+Pilha síncrona de referência para os benchmarks: as rotas de leitura de
+posts como eram antes da migração para o engine assíncrono (handlers `def`
+no threadpool, Session síncrona, ORM + PostPublic, sem cache de respostas),
+sobre o mesmo banco e com os mesmos ajustes do SQLite de core.database.
+O login é o de antes do HashingPool: o Argon2 roda direto no threadpool,
+sem limite de operações pendentes.
+
+    python -m benchmarks.run --app baseline --scenario list_posts,read_post \\
+        --concurrency 50,200,1000 --output sync.json
+    CACHE_BACKEND=none python -m benchmarks.run --scenario list_posts,read_post \\
+        --concurrency 50,200,1000 --output async.json --compare sync.json
+
+Compare com a aplicação atual com CACHE_BACKEND=none: assim a diferença
+medida é a do modelo de execução, não a do cache.
+"""
+
+import time
+from typing import Optional
+
+from fastapi import Depends, FastAPI, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import event
+from sqlalchemy.orm import joinedload
+from sqlmodel import Session, create_engine, select
+
+from core import metrics
+from core.config import settings
+from core.database import engine_options, set_sqlite_pragmas
+from core.security import create_access_token, verify_password
+from models import Post, User
+from schemas import PostPage, PostPublic
+from utilities.dependencies import check_max_limit
+from utilities.pagination import decode_cursor, encode_cursor
+
+# Threads do threadpool do AnyIO, onde rodam os handlers `def`
+THREADPOOL_SIZE = 40
+
+# Uma conexão por thread do threadpool
+engine = create_engine(
+    settings.DATABASE_URL,
+    **{
+        **engine_options(settings.DATABASE_URL),
+        "pool_size": THREADPOOL_SIZE,
+        "max_overflow": 0,
+    },
+)
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", set_sqlite_pragmas)
+metrics.instrument_engine(engine)
+
+app = FastAPI(title="Referência síncrona (benchmarks)")
+
+# A sessão é aberta dentro do handler, e não em uma dependência com yield:
+# o encerramento da dependência roda em outra vaga do threadpool, e com
+# mais requisições que threads as conexões ficariam presas esperando por
+# ela enquanto as threads esperam por uma conexão (deadlock)
+
+
+@app.middleware("http")
+async def collect_db_stats(request: Request, call_next):
+    # Mesmas métricas de main.py, lidas por benchmarks.run em /metrics
+    db_stats = metrics.start_request_tracking()
+    started = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    path = route.path if route is not None else "<sem rota>"
+    metrics.http_request_duration.observe(
+        time.perf_counter() - started, request.method, path
+    )
+    metrics.db_queries_per_request.observe(db_stats[0], request.method, path)
+    return response
+
+
+@app.get("/metrics", include_in_schema=False)
+def read_metrics():
+    return PlainTextResponse(
+        metrics.registry.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@app.get("/readyz", include_in_schema=False)
+def readyz():
+    return {"status": "ready"}
+
+
+@app.get("/posts/", response_model=PostPage)
+def list_posts(
+    limit: int = Depends(check_max_limit),
+    published: Optional[bool] = True,
+    author_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+):
+    statement = (
+        select(Post).options(joinedload(Post.author)).order_by(Post.id.desc())
+    )
+    if published is not None:
+        statement = statement.where(Post.published == published)
+    if author_id is not None:
+        statement = statement.where(Post.author_id == author_id)
+
+    after = decode_cursor(cursor)
+    if after is not None:
+        last_id = after.get("id")
+        if not isinstance(last_id, int):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido."
+            )
+        statement = statement.where(Post.id < last_id)
+
+    with Session(engine) as db:
+        results = db.exec(statement.limit(limit + 1)).all()
+        items = results[:limit]
+
+        next_cursor = None
+        if len(results) > limit:
+            next_cursor = encode_cursor({"id": items[-1].id})
+
+        return PostPage.model_validate(
+            {"items": items, "next_cursor": next_cursor}, from_attributes=True
+        )
+
+
+@app.get("/posts/{post_id}", response_model=PostPublic)
+def read_post(post_id: int):
+    statement = select(Post).where(Post.id == post_id).options(joinedload(Post.author))
+    with Session(engine) as db:
+        post = db.exec(statement).first()
+        if not post:
+            raise HTTPException(
+                status_code=404, detail=f"Post com ID {post_id} não encontrado."
+            )
+        return PostPublic.model_validate(post, from_attributes=True)
+
+
+@app.post("/auth/token")
+def login_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
+    with Session(engine) as db:
+        user = db.exec(select(User).where(User.email == form_data.username)).first()
+    if not user or not verify_password(form_data.password, user.password):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Credenciais inválidas.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    access_token = create_access_token(data={"sub": user.email})
+    return {"access_token": access_token, "token_type": "bearer"}
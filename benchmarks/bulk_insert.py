@@ -0,0 +1,73 @@
+"""
+Compara a importação de posts via POST /posts/ (um por requisição) com
+POST /posts/bulk, usando a aplicação real em processo (ASGI) e um banco
+SQLite temporário.
+
+    python -m benchmarks.bulk_insert --posts 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+
+async def _run(posts: int):
+    # Importados aqui: dependem da DATABASE_URL definida em main()
+    import httpx
+
+    from core.database import create_db_and_tables
+    from main import app
+
+    create_db_and_tables()
+    transport = httpx.ASGITransport(app=app)
+    client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+    async with client:
+        response = await client.post(
+            "/users/",
+            json={"username": "bench", "email": "bench@bench.com", "password": "x"},
+        )
+        author_id = response.json()["id"]
+        payload = [
+            {"title": f"post {i}", "content": "x" * 500, "author_id": author_id}
+            for i in range(posts)
+        ]
+
+        started = time.perf_counter()
+        for item in payload:
+            await client.post("/posts/", json=item)
+        per_row = time.perf_counter() - started
+
+        body = "\n".join(json.dumps(item) for item in payload).encode("utf-8")
+        started = time.perf_counter()
+        response = await client.post(
+            "/posts/bulk",
+            content=body,
+            headers={"content-type": "application/x-ndjson"},
+        )
+        bulk = time.perf_counter() - started
+        created = sum(1 for item in response.json() if item["status"] == 201)
+
+    for name, count, seconds in (
+        ("POST /posts/", posts, per_row),
+        ("POST /posts/bulk", created, bulk),
+    ):
+        rate = count / seconds
+        print(f"{name:<17} {count:>7} posts em {seconds:7.2f}s ({rate:8.0f}/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inserção unitária x em lote.")
+    parser.add_argument("--posts", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ["RATE_LIMIT_ENABLED"] = "false"  # tudo sai de um único IP
+        asyncio.run(_run(args.posts))
+
+
+if __name__ == "__main__":
+    main()
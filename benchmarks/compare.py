@@ -0,0 +1,68 @@
+"""
+Compara dois resultados salvos por `benchmarks.run` e aponta regressões.
+
+    python -m benchmarks.compare baseline.json atual.json --threshold 0.10
+
+Sai com código 1 se algum cenário perdeu mais que `threshold` de throughput
+ou piorou o p99 além desse limite.
+"""
+
+import argparse
+import json
+import sys
+from typing import List
+
+
+def _key(result: dict) -> tuple:
+    return result["scenario"], result["concurrency"]
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> List[str]:
+    """Retorna a lista de regressões encontradas (vazia se não houver)."""
+    previous = {_key(result): result for result in baseline["results"]}
+    regressions = []
+
+    for result in current["results"]:
+        before = previous.get(_key(result))
+        if before is None:
+            continue
+
+        name = f"{result['scenario']} @ {result['concurrency']}"
+        throughput = result["throughput"] / before["throughput"] - 1
+        p99 = result["latency_ms"]["p99"] / before["latency_ms"]["p99"] - 1
+        print(
+            f"{name:<28} throughput {throughput:+7.1%}  p99 {p99:+7.1%}  "
+            f"queries/req {before['queries_per_request']:.2f} -> "
+            f"{result['queries_per_request']:.2f}"
+        )
+
+        if throughput < -threshold:
+            regressions.append(f"{name}: throughput caiu {-throughput:.1%}")
+        if p99 > threshold:
+            regressions.append(f"{name}: p99 subiu {p99:.1%}")
+        if result["queries_per_request"] > before["queries_per_request"] + 0.5:
+            regressions.append(f"{name}: mais queries por requisição")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara resultados de benchmark.")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    with open(args.current, encoding="utf-8") as file:
+        current = json.load(file)
+
+    regressions = compare(baseline, current, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSÃO: {regression}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
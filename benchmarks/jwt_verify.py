@@ -0,0 +1,68 @@
+"""
+Tokens JWT verificados por segundo em cada caminho: python-jose recebendo o
+segredo a cada chamada (como antes), os backends de core.tokens com a chave
+já processada e decode_token com o cache de tokens verificados.
+
+    python -m benchmarks.jwt_verify --seconds 2
+"""
+
+import argparse
+import time
+
+from core.config import settings
+
+
+def _rate(fn, seconds: float) -> float:
+    calls = 0
+    deadline = time.perf_counter() + seconds
+    started = time.perf_counter()
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            fn()
+        calls += 100
+    return calls / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verificações de JWT por segundo.")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    from jose import jwt as jose_jwt
+
+    from core import security
+    from core.tokens import HMACBackend, JoseBackend, PyJWTBackend
+
+    token = security.create_access_token(data={"sub": "bench@bench.com"})
+    secret, algorithm = settings.SECRET_KEY, settings.ALGOTITHM
+
+    backends = [JoseBackend(secret, algorithm), HMACBackend(secret, algorithm)]
+    try:
+        backends.append(PyJWTBackend(secret, algorithm))
+    except ImportError:
+        print("PyJWT não instalado: backend pyjwt ignorado.")
+
+    paths = [
+        (
+            "jose, segredo por chamada",
+            lambda: jose_jwt.decode(token, secret, algorithms=[algorithm]),
+        )
+    ]
+    paths += [
+        (f"{backend.name}, chave pronta", lambda b=backend: b.decode(token))
+        for backend in backends
+    ]
+    paths.append(
+        (
+            f"decode_token com cache ({security.jwt_backend.name})",
+            lambda: security.decode_token(token),
+        )
+    )
+
+    for name, fn in paths:
+        fn()  # aquece (e popula o cache de tokens)
+        print(f"{name:<34} {_rate(fn, args.seconds):>12,.0f} tokens/s")
+
+
+if __name__ == "__main__":
+    main()
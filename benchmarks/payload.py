@@ -0,0 +1,128 @@
+"""
+Bytes por página de GET /posts/ em cada combinação de campos (`fields=`) e
+compressão (Accept-Encoding), e o que cada seleção custa no banco: bytes das
+colunas lidas e tempo da query. A primeira linha ("completo", identity) é o
+comportamento anterior.
+
+    python -m benchmarks.payload --posts 2000 --content-size 4000 --limit 50
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+import httpx
+
+# Seleções comparadas: None é a representação completa (PostPublic)
+FIELD_SETS = (
+    ("completo", None),
+    ("title,excerpt,author", "title,excerpt,author"),
+    ("title,author", "title,author"),
+    ("id,title", "id,title"),
+)
+
+
+def _row_bytes(row) -> int:
+    return sum(len(str(value).encode("utf-8")) for value in row if value is not None)
+
+
+def measure_db(engine, fields, limit: int, repeat: int) -> tuple:
+    """Bytes das colunas de uma página e tempo médio da query (ms)."""
+    from sqlmodel import Session
+
+    from models import Post
+    from utilities.serialization import parse_post_fields, select_post_rows
+
+    statement = (
+        select_post_rows(fields=parse_post_fields(fields))
+        .where(Post.published == True)  # noqa: E712
+        .order_by(Post.id.desc())
+        .limit(limit)
+    )
+    with Session(engine) as session:
+        rows = session.exec(statement).all()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            session.exec(statement).all()
+        elapsed = (time.perf_counter() - started) / repeat * 1000
+    return sum(_row_bytes(row) for row in rows), elapsed
+
+
+async def measure_wire(client, fields, encoding: str, limit: int, pages: int):
+    """Bytes transferidos, bytes do JSON e latência média por página."""
+    wire, body, latencies = [], [], []
+    cursor = None
+    for _ in range(pages):
+        params = {"limit": limit}
+        if fields is not None:
+            params["fields"] = fields
+        if cursor is not None:
+            params["cursor"] = cursor
+        started = time.perf_counter()
+        response = await client.get(
+            "/posts/", params=params, headers={"Accept-Encoding": encoding}
+        )
+        latencies.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+        wire.append(response.num_bytes_downloaded)
+        body.append(len(response.content))
+        cursor = response.json()["next_cursor"]
+        if cursor is None:
+            break
+    return statistics.mean(wire), statistics.mean(body), statistics.mean(latencies)
+
+
+async def run(args):
+    from core.compression import brotli
+    from core.database import engine
+    from main import app
+
+    encodings = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+    if brotli is None:
+        print("brotli não instalado: só identity e gzip.\n")
+
+    print(
+        f"{'campos':<22} {'DB bytes':>9} {'DB ms':>6} "
+        f"{'encoding':<9} {'JSON':>8} {'na rede':>8} {'ms/pág':>7}"
+    )
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        for name, fields in FIELD_SETS:
+            db_bytes, db_ms = measure_db(engine, fields, args.limit, args.repeat)
+            for encoding in encodings:
+                wire, body, latency = await measure_wire(
+                    client, fields, encoding, args.limit, args.pages
+                )
+                print(
+                    f"{name:<22} {db_bytes:>9,} {db_ms:>6.2f} "
+                    f"{encoding:<9} {body:>8,.0f} {wire:>8,.0f} {latency:>7.2f}"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes por página de posts.")
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--content-size", type=int, default=4000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--pages", type=int, default=20, help="Páginas por medida.")
+    parser.add_argument("--repeat", type=int, default=200, help="Queries por medida.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        # Sem cache de respostas: cada página vai ao banco e é serializada
+        os.environ["CACHE_BACKEND"] = "none"
+        os.environ["RATE_LIMIT_ENABLED"] = "false"  # tudo sai de um único IP
+
+        from benchmarks.seed import seed
+
+        seed(20, args.posts, args.content_size)
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""
+Executa os cenários de carga contra a aplicação real e salva os resultados.
+
+    python -m benchmarks.seed --database bench.db --users 1000 --posts 100000
+    python -m benchmarks.run --database bench.db --scenario all \\
+        --concurrency 50,200 --duration 10 --output resultados.json
+
+Modos:
+  asgi     aplicação em processo (httpx + ASGITransport), sem rede
+  uvicorn  sobe `uvicorn main:app` em um subprocesso e usa HTTP de verdade
+
+Com --app baseline, mede a pilha síncrona de referência
+(benchmarks/baseline_app.py) em vez da aplicação atual.
+
+Relata throughput, latência p50/p95/p99 e queries SQL por requisição (lidas
+de /metrics). Com --compare, compara com um resultado anterior e sai com
+código 1 se houver regressão.
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from typing import List, Optional
+
+import httpx
+
+from benchmarks.compare import compare
+from benchmarks.scenarios import SCENARIOS, Context, authenticate, load_context
+
+# Módulo:atributo de cada aplicação medida
+APPS = {"current": "main:app", "baseline": "benchmarks.baseline_app:app"}
+# Cenários que a referência síncrona implementa
+BASELINE_SCENARIOS = ("list_posts", "read_post", "login")
+# Cenários que precisam dos tokens dos autores
+AUTHENTICATED_SCENARIOS = ("update_post", "mixed")
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _db_query_totals(client: httpx.AsyncClient) -> tuple:
+    """Soma (statements, requisições) de db_queries_per_request em /metrics."""
+    response = await client.get("/metrics")
+    queries = requests = 0.0
+    for line in response.text.splitlines():
+        if line.startswith("db_queries_per_request_sum"):
+            queries += float(line.rsplit(" ", 1)[1])
+        elif line.startswith("db_queries_per_request_count"):
+            requests += float(line.rsplit(" ", 1)[1])
+    return queries, requests
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    scenario_name: str,
+    context: Context,
+    concurrency: int,
+    duration: float,
+) -> dict:
+    scenario = SCENARIOS[scenario_name]
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                status = await scenario(client, context)
+            except httpx.HTTPError:
+                status = 0  # falha de conexão/timeout
+            latencies.append(time.perf_counter() - started)
+            statuses[status] += 1
+
+    queries_before, requests_before = await _db_query_totals(client)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    queries_after, requests_after = await _db_query_totals(client)
+
+    # A própria chamada a /metrics de "antes" entra na contagem de requisições
+    measured = max(requests_after - requests_before - 1, 1)
+    errors = sum(count for status, count in statuses.items() if not 200 <= status < 400)
+
+    return {
+        "scenario": scenario_name,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "duration_s": elapsed,
+        "throughput": len(latencies) / elapsed,
+        "errors": errors,
+        "status_counts": {str(status): count for status, count in statuses.items()},
+        "latency_ms": {
+            "mean": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+            "p50": _percentile(latencies, 50) * 1000,
+            "p95": _percentile(latencies, 95) * 1000,
+            "p99": _percentile(latencies, 99) * 1000,
+        },
+        "queries_per_request": (queries_after - queries_before) / measured,
+    }
+
+
+def _start_uvicorn(
+    app: str, database: str, port: int, workers: int
+) -> subprocess.Popen:
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{database}"}
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", APPS[app],
+            "--port", str(port),
+            "--workers", str(workers),
+            "--log-level", "warning",
+        ],
+        env=env,
+    )
+
+
+async def _wait_until_up(client: httpx.AsyncClient, timeout: float = 30):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if (await client.get("/readyz")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("O servidor não respondeu a tempo.")
+
+
+async def run(args) -> dict:
+    if args.scenario == "all":
+        scenarios = list(SCENARIOS)
+    else:
+        scenarios = args.scenario.split(",")
+    if args.app == "baseline":
+        unsupported = [name for name in scenarios if name not in BASELINE_SCENARIOS]
+        if args.scenario == "all":
+            scenarios = list(BASELINE_SCENARIOS)
+        elif unsupported:
+            raise SystemExit(
+                f"A referência síncrona não implementa: {', '.join(unsupported)}."
+            )
+    levels = [int(level) for level in args.concurrency.split(",")]
+    limits = httpx.Limits(
+        max_connections=max(levels), max_keepalive_connections=max(levels)
+    )
+    timeout = httpx.Timeout(60)
+
+    server: Optional[subprocess.Popen] = None
+    lifespan = nullcontext()
+    if args.mode == "uvicorn":
+        server = _start_uvicorn(args.app, args.database, args.port, args.workers)
+        client = httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=timeout
+        )
+    else:
+        # Importada aqui: depende da DATABASE_URL definida em main()
+        module, _, attribute = APPS[args.app].partition(":")
+        app = getattr(importlib.import_module(module), attribute)
+
+        # O ASGITransport não envia os eventos de lifespan: sem rodá-lo aqui,
+        # a migração não acontece e /readyz fica em 503
+        lifespan = app.router.lifespan_context(app)
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://bench",
+            limits=limits,
+            timeout=timeout,
+        )
+
+    results = []
+    try:
+        async with lifespan, client:
+            await _wait_until_up(client)
+            context = load_context(args.database)
+            if not context.post_ids:
+                raise SystemExit("Banco vazio: rode `python -m benchmarks.seed`.")
+            if any(name in AUTHENTICATED_SCENARIOS for name in scenarios):
+                await authenticate(client, context)
+
+            for scenario in scenarios:
+                for level in levels:
+                    result = await drive(
+                        client, scenario, context, level, args.duration
+                    )
+                    results.append(result)
+                    latency = result["latency_ms"]
+                    print(
+                        f"{scenario:<12} c={level:<5} "
+                        f"{result['throughput']:9.1f} req/s  "
+                        f"p50 {latency['p50']:8.1f}ms  p95 {latency['p95']:8.1f}ms  "
+                        f"p99 {latency['p99']:8.1f}ms  "
+                        f"queries/req {result['queries_per_request']:5.2f}  "
+                        f"erros {result['errors']}"
+                    )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    return {
+        "meta": {
+            "mode": args.mode,
+            "app": args.app,
+            "workers": args.workers if args.mode == "uvicorn" else 1,
+            "database": args.database,
+            "duration_s": args.duration,
+            "python": platform.python_version(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de carga da API.")
+    parser.add_argument("--database", default="bench.db")
+    parser.add_argument("--mode", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument(
+        "--app",
+        choices=list(APPS),
+        default="current",
+        help="Aplicação medida: a atual ou a referência síncrona.",
+    )
+    parser.add_argument(
+        "--scenario",
+        default="all",
+        help=f"'all' ou lista separada por vírgula: {', '.join(SCENARIOS)}",
+    )
+    parser.add_argument(
+        "--concurrency", default="50", help="Níveis de concorrência, ex.: 50,200,1000"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=10, help="Segundos por nível."
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--output", help="Arquivo JSON para salvar os resultados.")
+    parser.add_argument("--compare", help="Resultado anterior (JSON) para comparar.")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{args.database}"
+    # Todo o tráfego sai de um único IP: o rate limit por IP mediria a si mesmo
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    report = asyncio.run(run(args))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(baseline, report, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSÃO: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
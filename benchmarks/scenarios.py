@@ -0,0 +1,131 @@
+"""
+Cenários de carga. Cada cenário é uma função assíncrona que recebe o cliente
+HTTP e o contexto (ids e tokens carregados antes da medição) e faz UMA
+requisição, retornando o status HTTP.
+"""
+
+import random
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+from benchmarks.seed import BENCH_PASSWORD, user_email
+
+
+@dataclass
+class Context:
+    post_ids: List[int]
+    user_ids: List[int]
+    user_count: int
+    # Autores com token e ids dos posts dele (para o PUT autenticado)
+    authors: List[dict] = field(default_factory=list)
+    rng: random.Random = field(default_factory=lambda: random.Random(7))
+
+
+def load_context(database: str, authors: int = 20) -> Context:
+    """Lê do banco os ids que os cenários vão usar."""
+    conn = sqlite3.connect(database)
+    try:
+        post_ids = [row[0] for row in conn.execute("SELECT id FROM post")]
+        user_ids = [row[0] for row in conn.execute("SELECT id FROM user")]
+        user_count = conn.execute(
+            "SELECT COUNT(*) FROM user WHERE email LIKE 'bench%@bench.com'"
+        ).fetchone()[0]
+        author_rows = conn.execute(
+            "SELECT u.id, u.email FROM user u "
+            "WHERE u.email LIKE 'bench%@bench.com' "
+            "AND EXISTS (SELECT 1 FROM post p WHERE p.author_id = u.id) "
+            "ORDER BY u.id LIMIT ?",
+            (authors,),
+        ).fetchall()
+        context = Context(post_ids=post_ids, user_ids=user_ids, user_count=user_count)
+        for user_id, email in author_rows:
+            ids = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT id FROM post WHERE author_id = ? LIMIT 100", (user_id,)
+                )
+            ]
+            context.authors.append(
+                {"id": user_id, "email": email, "post_ids": ids, "token": None}
+            )
+    finally:
+        conn.close()
+    return context
+
+
+async def authenticate(client: httpx.AsyncClient, context: Context):
+    """Gera os tokens dos autores antes da medição."""
+    for author in context.authors:
+        response = await client.post(
+            "/auth/token",
+            data={"username": author["email"], "password": BENCH_PASSWORD},
+        )
+        response.raise_for_status()
+        author["token"] = response.json()["access_token"]
+
+
+async def list_posts(client: httpx.AsyncClient, context: Context) -> int:
+    params = {"limit": 20}
+    if context.rng.random() < 0.5:
+        params["author_id"] = context.rng.choice(context.user_ids)
+    response = await client.get("/posts/", params=params)
+    return response.status_code
+
+
+async def read_post(client: httpx.AsyncClient, context: Context) -> int:
+    post_id = context.rng.choice(context.post_ids)
+    response = await client.get(f"/posts/{post_id}")
+    return response.status_code
+
+
+async def login(client: httpx.AsyncClient, context: Context) -> int:
+    email = user_email(context.rng.randrange(context.user_count))
+    response = await client.post(
+        "/auth/token", data={"username": email, "password": BENCH_PASSWORD}
+    )
+    return response.status_code
+
+
+async def update_post(client: httpx.AsyncClient, context: Context) -> int:
+    author = context.rng.choice(context.authors)
+    post_id = context.rng.choice(author["post_ids"])
+    response = await client.put(
+        f"/posts/{post_id}",
+        json={
+            "title": f"editado {context.rng.random():.6f}",
+            "content": "conteúdo atualizado pelo benchmark",
+            "author_id": author["id"],
+        },
+        headers={"Authorization": f"Bearer {author['token']}"},
+    )
+    return response.status_code
+
+
+Scenario = Callable[[httpx.AsyncClient, Context], Awaitable[int]]
+
+# Mistura realista: leitura domina, com algumas escritas e logins
+MIXED_WEIGHTS: Dict[Scenario, float] = {
+    read_post: 0.60,
+    list_posts: 0.25,
+    update_post: 0.10,
+    login: 0.05,
+}
+
+
+async def mixed(client: httpx.AsyncClient, context: Context) -> int:
+    scenario = context.rng.choices(
+        list(MIXED_WEIGHTS), weights=list(MIXED_WEIGHTS.values())
+    )[0]
+    return await scenario(client, context)
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "list_posts": list_posts,
+    "read_post": read_post,
+    "login": login,
+    "update_post": update_post,
+    "mixed": mixed,
+}
@@ -0,0 +1,90 @@
+"""
+Popula um banco com usuários e posts para os benchmarks.
+
+    python -m benchmarks.seed --database bench.db --users 1000 --posts 100000
+
+Todos os usuários são bench<N>@bench.com com a senha BENCH_PASSWORD. O hash
+Argon2 é calculado uma vez e reaproveitado, senão o seed levaria horas.
+"""
+
+import argparse
+import os
+import random
+import time
+
+BENCH_PASSWORD = "benchpass"
+CHUNK_SIZE = 5000
+
+
+def user_email(index: int) -> str:
+    return f"bench{index}@bench.com"
+
+
+def seed(users: int, posts: int, content_size: int = 1000):
+    # Importados aqui: dependem da DATABASE_URL definida por quem chama
+    from sqlalchemy import func, insert
+    from sqlmodel import Session, select
+
+    from core.counters import reconcile_post_counts
+    from core.database import create_db_and_tables, engine
+    from core.security import get_password_hash
+    from models import Post, User
+
+    create_db_and_tables()
+    password = get_password_hash(BENCH_PASSWORD)
+    rng = random.Random(42)
+
+    with Session(engine) as session:
+        first_user = session.exec(select(func.count()).select_from(User)).one()
+        rows = [
+            {
+                "username": f"bench{index}",
+                "email": user_email(index),
+                "password": password,
+            }
+            for index in range(first_user, first_user + users)
+        ]
+        for start in range(0, len(rows), CHUNK_SIZE):
+            session.exec(insert(User), params=rows[start : start + CHUNK_SIZE])
+        session.commit()
+
+        author_ids = session.exec(select(User.id)).all()
+        words = ["blog", "python", "fastapi", "sqlite", "cache", "índice", "busca"]
+        for start in range(0, posts, CHUNK_SIZE):
+            batch = [
+                {
+                    "title": " ".join(rng.choices(words, k=5)),
+                    "content": " ".join(rng.choices(words, k=content_size // 7)),
+                    "published": rng.random() < 0.9,
+                    "author_id": rng.choice(author_ids),
+                }
+                for _ in range(min(CHUNK_SIZE, posts - start))
+            ]
+            session.exec(insert(Post), params=batch)
+            session.commit()
+
+    # Inserções diretas não passam pelas rotas: acerta os contadores de posts
+    reconcile_post_counts(engine)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Popula o banco dos benchmarks.")
+    parser.add_argument("--database", default="bench.db", help="Arquivo SQLite.")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--posts", type=int, default=100_000)
+    parser.add_argument(
+        "--content-size", type=int, default=1000, help="Tamanho médio do conteúdo."
+    )
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{args.database}"
+    started = time.perf_counter()
+    seed(args.users, args.posts, args.content_size)
+    print(
+        f"{args.users} usuários e {args.posts} posts em {args.database} "
+        f"({time.perf_counter() - started:.1f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Custo de montar o JSON de uma página de posts, por tamanho de página,
+comparando o caminho antigo (ORM + validação from_attributes) com o caminho
+rápido de utilities.serialization (tuplas + orjson). Mede só a serialização
+(dados já carregados) e a leitura + serialização.
+
+    python -m benchmarks.serialization --pages 10,50,100
+"""
+
+import argparse
+import json
+import time
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy.orm import joinedload
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from models import Post, User
+from schemas import PostPublic
+from utilities.serialization import dumps, post_payload, select_post_rows
+
+_PAGE = TypeAdapter(List[PostPublic])
+
+
+def _seed(engine, posts: int):
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        authors = [
+            User(username=f"user{i}", email=f"user{i}@bench.com", password="x")
+            for i in range(20)
+        ]
+        session.add_all(authors)
+        session.flush()
+        session.add_all(
+            Post(
+                title=f"Post {i}",
+                content="Lorem ipsum dolor sit amet " * 20,
+                author_id=authors[i % len(authors)].id,
+            )
+            for i in range(posts)
+        )
+        session.commit()
+
+
+# Caminhos de serialização (recebem o resultado já carregado)
+
+
+def stdlib(posts) -> bytes:
+    # Antes: validação from_attributes + jsonable_encoder + json.dumps
+    items = jsonable_encoder(_PAGE.validate_python(posts, from_attributes=True))
+    return json.dumps({"items": items, "next_cursor": None}).encode("utf-8")
+
+
+def pydantic(posts) -> bytes:
+    # Validação from_attributes + dump_json do pydantic-core
+    items = _PAGE.validate_python(posts, from_attributes=True)
+    return _PAGE.dump_json(items)
+
+
+def orm_orjson(posts) -> bytes:
+    # Validação + jsonable_encoder + orjson (o que um ORJSONResponse faria)
+    items = jsonable_encoder(_PAGE.validate_python(posts, from_attributes=True))
+    return dumps({"items": items, "next_cursor": None})
+
+
+def rows_orjson(rows) -> bytes:
+    # Depois: dicionários direto das tuplas, sem validação, codificados no orjson
+    return dumps({"items": [post_payload(row) for row in rows], "next_cursor": None})
+
+
+def _load_orm(session, size):
+    statement = (
+        select(Post).options(joinedload(Post.author)).order_by(Post.id).limit(size)
+    )
+    return session.exec(statement).all()
+
+
+def _load_rows(session, size):
+    return session.exec(select_post_rows().order_by(Post.id).limit(size)).all()
+
+
+def _per_call(fn, *args, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(*args)
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Custo de serialização por página.")
+    parser.add_argument("--pages", default="10,50,100")
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.pages.split(",")]
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    _seed(engine, max(sizes))
+
+    paths = (
+        ("orm + stdlib json", _load_orm, stdlib),
+        ("orm + pydantic dump_json", _load_orm, pydantic),
+        ("orm + orjson", _load_orm, orm_orjson),
+        ("tuplas + orjson", _load_rows, rows_orjson),
+    )
+
+    header = f"{'caminho':<26} {'página':>6} {'serializar (µs)':>16} {'total (µs)':>11}"
+    print(header)
+    with Session(engine) as session:
+        for size in sizes:
+            for name, load, serialize in paths:
+                data = load(session, size)
+                serialize_us = _per_call(serialize, data, repeat=args.repeat)
+
+                def load_and_serialize():
+                    # Sessão limpa: sem o identity map, a leitura é refeita
+                    session.expunge_all()
+                    serialize(load(session, size))
+
+                total_us = _per_call(load_and_serialize, repeat=args.repeat)
+                print(f"{name:<26} {size:>6} {serialize_us:>16.1f} {total_us:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark de leitura/escrita concorrente no SQLite, comparando a configuração
+padrão (journal DELETE, synchronous FULL) com a aplicada por
+`core.database.set_sqlite_pragmas` (WAL, synchronous NORMAL, mmap, busy_timeout).
+
+    python -m benchmarks.sqlite_mixed --readers 8 --writers 2 --seconds 5
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+DEFAULT_PRAGMAS = ["PRAGMA journal_mode=DELETE", "PRAGMA synchronous=FULL"]
+TUNED_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA mmap_size={256 * 1024 * 1024}",
+]
+
+
+def _connect(path: str, pragmas) -> sqlite3.Connection:
+    # timeout equivale ao busy_timeout: espera o lock em vez de falhar
+    conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+    for pragma in pragmas:
+        conn.execute(pragma)
+    return conn
+
+
+def _seed(path: str, rows: int):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE post (id INTEGER PRIMARY KEY, title TEXT, content TEXT, "
+        "published BOOLEAN, author_id INTEGER)"
+    )
+    conn.executemany(
+        "INSERT INTO post (title, content, published, author_id) VALUES (?, ?, 1, 1)",
+        ((f"post {i}", "x" * 500) for i in range(rows)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def run(pragmas, readers: int, writers: int, seconds: float, rows: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        _seed(path, rows)
+
+        counts = {"reads": 0, "writes": 0, "errors": 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + seconds
+
+        def reader():
+            conn = _connect(path, pragmas)
+            done = 0
+            while time.perf_counter() < deadline:
+                conn.execute(
+                    "SELECT id, title FROM post ORDER BY id DESC LIMIT 10"
+                ).fetchall()
+                done += 1
+            with lock:
+                counts["reads"] += done
+
+        def writer():
+            conn = _connect(path, pragmas)
+            done = errors = 0
+            while time.perf_counter() < deadline:
+                try:
+                    with conn:
+                        conn.execute(
+                            "INSERT INTO post (title, content, published, author_id) "
+                            "VALUES ('novo', 'conteudo', 1, 1)"
+                        )
+                    done += 1
+                except sqlite3.OperationalError:
+                    errors += 1
+            with lock:
+                counts["writes"] += done
+                counts["errors"] += errors
+
+        threads = [threading.Thread(target=reader) for _ in range(readers)]
+        threads += [threading.Thread(target=writer) for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    return {
+        "reads_per_s": counts["reads"] / seconds,
+        "writes_per_s": counts["writes"] / seconds,
+        "errors": counts["errors"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Leitura/escrita concorrente no SQLite."
+    )
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    for name, pragmas in (("padrão", DEFAULT_PRAGMAS), ("ajustado", TUNED_PRAGMAS)):
+        result = run(pragmas, args.readers, args.writers, args.seconds, args.rows)
+        print(
+            f"{name:>9}: {result['reads_per_s']:>10.0f} leituras/s  "
+            f"{result['writes_per_s']:>8.0f} escritas/s  erros={result['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
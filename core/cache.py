@@ -0,0 +1,339 @@
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from core.config import settings
+
+
+class TTLCache:
+    """
+    Cache em memória com tamanho máximo (LRU) e tempo de vida por item.
+    Seguro para uso entre threads (dependências síncronas rodam no threadpool).
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[1] <= time.monotonic():
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+# --- Cache de respostas (JSON pré-serializado) ---
+
+
+class CacheBackend:
+    """
+    Interface dos backends do cache de respostas. Valores são bytes.
+    """
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: int):
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        raise NotImplementedError
+
+    async def incr(self, key: str) -> int:
+        raise NotImplementedError
+
+    async def close(self):
+        """Libera conexões do backend (chamado no shutdown da aplicação)."""
+
+
+class NullCacheBackend(CacheBackend):
+    """Cache desligado: toda leitura é um miss."""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return None
+
+    async def set(self, key: str, value: bytes, ttl: int):
+        pass
+
+    async def delete(self, key: str):
+        pass
+
+    async def incr(self, key: str) -> int:
+        return 0
+
+
+class MemoryCacheBackend(CacheBackend):
+    """LRU em memória, por processo."""
+
+    def __init__(self, maxsize: int):
+        self._cache = TTLCache(maxsize, ttl=float("inf"))
+        # Contadores ficam fora do LRU: nunca podem ser descartados
+        self._counters: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if key in self._counters:
+            return str(self._counters[key]).encode("ascii")
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int):
+        self._cache.set(key, value, ttl=ttl)
+
+    async def delete(self, key: str):
+        self._cache.delete(key)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Backend compatível com Redis, compartilhado entre processos. Depende do
+    pacote `redis` (opcional); em testes pode receber um cliente fakeredis.
+    """
+
+    def __init__(self, url: str, client=None):
+        if client is None:
+            import redis.asyncio as redis
+
+            client = redis.Redis.from_url(url)
+        self._client = client
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int):
+        await self._client.set(key, value, ex=ttl)
+
+    async def delete(self, key: str):
+        await self._client.delete(key)
+
+    async def incr(self, key: str) -> int:
+        return await self._client.incr(key)
+
+    async def close(self):
+        await self._client.aclose()
+
+
+def create_cache_backend() -> CacheBackend:
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.CACHE_URL)
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryCacheBackend(settings.CACHE_MAX_ENTRIES)
+    return NullCacheBackend()
+
+
+@dataclass
+class CachedResponse:
+    """
+    Corpo JSON já serializado + metadados HTTP. Um hit devolve os bytes
+    direto, sem passar pelo ORM nem pela validação do Pydantic.
+    """
+
+    body: bytes
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    def to_bytes(self) -> bytes:
+        meta = {
+            "etag": self.etag,
+            "last_modified": self.last_modified.isoformat()
+            if self.last_modified
+            else None,
+        }
+        return json.dumps(meta).encode("utf-8") + b"\n" + self.body
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "CachedResponse":
+        meta, body = raw.split(b"\n", 1)
+        meta = json.loads(meta)
+        last_modified = meta["last_modified"]
+        return cls(
+            body=body,
+            etag=meta["etag"],
+            last_modified=datetime.fromisoformat(last_modified)
+            if last_modified
+            else None,
+        )
+
+
+class ResponseCache:
+    """
+    Cache de respostas por rota, sobre um `CacheBackend`.
+
+    - Single-flight: requisições simultâneas para a mesma chave (neste
+      processo) esperam uma única carga do banco em vez de dispará-la N vezes.
+    - Gerações: chaves de listagem incluem um contador; uma escrita incrementa
+      o contador e todas as páginas antigas deixam de ser usadas de uma vez.
+      Uma carga com `namespace` só é guardada se a geração não mudou durante
+      ela: assim uma leitura lenta não sobrescreve com a versão anterior o que
+      uma escrita acabou de gravar ou remover. Por isso quem escreve incrementa
+      a geração *antes* de atualizar ou remover as chaves dos itens.
+    - Réplicas: cada invalidação deixa uma marca por `hold_ttl` segundos (o
+      atraso tolerado das réplicas); enquanto ela existe, uma entrada lida de
+      uma réplica é devolvida mas não guardada, para não trazer de volta o
+      dado que a escrita acabou de invalidar.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: int, hold_ttl: int = 0):
+        self.backend = backend
+        self.ttl = ttl
+        self.hold_ttl = hold_ttl
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    async def generation(self, namespace: str) -> int:
+        raw = await self.backend.get(f"gen:{namespace}")
+        return int(raw) if raw else 0
+
+    async def bump_generation(self, namespace: str):
+        await self.backend.incr(f"gen:{namespace}")
+        await self.hold(f"gen:{namespace}")
+
+    async def set(self, key: str, entry: CachedResponse):
+        await self.backend.set(key, entry.to_bytes(), self.ttl)
+
+    async def delete(self, key: str):
+        await self.backend.delete(key)
+        await self.hold(key)
+
+    async def hold(self, key: str):
+        """Marca `key` como recém-escrita (ver `get_or_load(replica=True)`)."""
+        if self.hold_ttl > 0:
+            await self.backend.set(f"hold:{key}", b"1", self.hold_ttl)
+
+    async def _held(self, key: str, namespace: Optional[str]) -> bool:
+        if self.hold_ttl <= 0:
+            return False
+        if await self.backend.get(f"hold:{key}") is not None:
+            return True
+        return (
+            namespace is not None
+            and await self.backend.get(f"hold:gen:{namespace}") is not None
+        )
+
+    async def _may_store(
+        self,
+        key: str,
+        namespace: Optional[str],
+        generation: Optional[int],
+        replica: bool,
+    ) -> bool:
+        if namespace and await self.generation(namespace) != generation:
+            return False
+        return not (replica and await self._held(key, namespace))
+
+    async def close(self):
+        await self.backend.close()
+
+    async def get_or_load(
+        self,
+        route: str,
+        key: str,
+        loader: Callable[[], Awaitable[Optional[CachedResponse]]],
+        replica: bool = False,
+        namespace: Optional[str] = None,
+    ) -> Optional[CachedResponse]:
+        """
+        Devolve a entrada do cache ou a carrega com `loader` (que pode
+        retornar None para "não existe"; isso não é guardado).
+
+        Com `namespace`, a entrada não é guardada se a geração dele mudou
+        durante a carga. Com `replica`, o `loader` lê de uma réplica: a
+        entrada só é guardada se nem `key` nem a geração de `namespace` foram
+        invalidadas há menos de `hold_ttl` segundos.
+        """
+        counters = self._stats.setdefault(route, {"hits": 0, "misses": 0})
+
+        raw = await self.backend.get(key)
+        if raw is not None:
+            counters["hits"] += 1
+            return CachedResponse.from_bytes(raw)
+        counters["misses"] += 1
+
+        # Outra requisição já está carregando esta chave: esperamos por ela
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            before = await self.generation(namespace) if namespace else None
+            entry = await loader()
+            if entry is not None and await self._may_store(
+                key, namespace, before, replica
+            ):
+                await self.set(key, entry)
+                # Uma escrita entre a comparação e o set: desfaz o set (no
+                # pior caso remove a versão nova, e a próxima leitura recarrega)
+                if namespace and await self.generation(namespace) != before:
+                    await self.backend.delete(key)
+            future.set_result(entry)
+            return entry
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Evita o aviso de "exception never retrieved" sem ninguém esperando
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def stats(self) -> dict:
+        result = {}
+        for route, counters in self._stats.items():
+            total = counters["hits"] + counters["misses"]
+            result[route] = {
+                **counters,
+                "hit_ratio": counters["hits"] / total if total else 0.0,
+            }
+        return result
+
+
+# Com réplicas, READ_YOUR_WRITES_SECONDS é o atraso que elas podem ter
+response_cache = ResponseCache(
+    create_cache_backend(),
+    settings.CACHE_TTL,
+    hold_ttl=settings.READ_YOUR_WRITES_SECONDS if settings.DATABASE_REPLICA_URLS else 0,
+)
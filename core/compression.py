@@ -0,0 +1,106 @@
+"""
+Compressão das respostas. Estende o GZipMiddleware do Starlette com Brotli:
+clientes que aceitam "br" recebem brotli (em texto, a qualidade 5 costuma
+gerar corpos menores que o gzip nível 6 em menos tempo), os demais gzip. O
+Brotli depende do pacote `brotli` (ou `brotlicffi`), opcional; sem ele, só
+gzip.
+
+Respostas menores que `minimum_size` vão sem compressão: em poucos bytes o
+ganho não paga o custo nem o header extra.
+"""
+
+from typing import Optional, Tuple
+
+import anyio.to_thread
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+
+def accepts_encoding(accept_encoding: str, coding: str) -> bool:
+    """Se o Accept-Encoding aceita `coding` (q=0 significa recusado)."""
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        if name.strip().lower() != coding:
+            continue
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        quality: int,
+        thread_minimum_size: int,
+        exclude_content_types: Tuple[str, ...],
+    ):
+        super().__init__(
+            app, minimum_size, exclude_content_types=exclude_content_types
+        )
+        self.quality = quality
+        self.thread_minimum_size = thread_minimum_size
+        self._compressor = None
+
+    def _compress_body(self, body: bytes, more_body: bool) -> bytes:
+        if self._compressor is None:
+            self._compressor = brotli.Compressor(
+                mode=brotli.MODE_TEXT, quality=self.quality
+            )
+        data = self._compressor.process(body)
+        if more_body:
+            return data + self._compressor.flush()
+        return data + self._compressor.finish()
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        # Corpos grandes são comprimidos em thread para não travar o event loop
+        if len(body) >= self.thread_minimum_size:
+            return await anyio.to_thread.run_sync(
+                self._compress_body, body, more_body
+            )
+        return self._compress_body(body, more_body)
+
+
+class CompressionMiddleware(GZipMiddleware):
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1000,
+        compresslevel: int = 6,
+        brotli_quality: Optional[int] = 5,
+    ):
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        # brotli_quality=None (ou pacote ausente) desliga o Brotli
+        self.brotli_quality = brotli_quality if brotli is not None else None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and self.brotli_quality is not None:
+            accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+            if accepts_encoding(accept_encoding, "br"):
+                responder = BrotliResponder(
+                    self.app,
+                    self.minimum_size,
+                    self.brotli_quality,
+                    self.thread_minimum_size,
+                    self.exclude_content_types,
+                )
+                await responder(scope, receive, send)
+                return
+        await super().__call__(scope, receive, send)
@@ -1,3 +1,5 @@
+from typing import List
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -7,9 +9,106 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "sua_chave_secreta_padrao_para_desenvolvimento_troque_em_prod"
     ALGOTITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Refresh token: renova o access token sem repetir o login (Argon2)
+    REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
+    # "hmac", "pyjwt", "jose" ou "auto" (hmac para HS*, senão python-jose)
+    JWT_BACKEND: str = "auto"
+
+    # Argon2 (custo de cada hash). Hashes com parâmetros antigos são
+    # refeitos automaticamente no próximo login.
+    ARGON2_TIME_COST: int = 2
+    ARGON2_MEMORY_COST: int = 102400  # KiB
+    ARGON2_PARALLELISM: int = 8
+
+    # Pool dedicado ao Argon2: quantas threads e quantas operações podem
+    # estar em andamento/na fila antes de responder 503.
+    HASH_WORKERS: int = 2
+    HASH_MAX_PENDING: int = 32
+
+    # Cache de autenticação (tokens decodificados e usuários resolvidos)
+    AUTH_CACHE_SIZE: int = 10000
+    AUTH_CACHE_TTL: int = 60  # segundos
+
+    # Cache de respostas das leituras de posts: "memory", "redis" ou "none"
+    CACHE_BACKEND: str = "memory"
+    CACHE_URL: str = "redis://localhost:6379/0"
+    CACHE_TTL: int = 60  # segundos
+    CACHE_MAX_ENTRIES: int = 10000
+
+    # Cache HTTP: max-age do Cache-Control das rotas públicas de leitura
+    HTTP_CACHE_MAX_AGE: int = 30  # segundos
+
+    # Listagens com `fields=excerpt`: caracteres do resumo do conteúdo
+    POST_EXCERPT_LENGTH: int = 200
+
+    # Compressão das respostas (gzip; brotli se o pacote estiver instalado e
+    # o cliente aceitar "br"). Corpos menores que o mínimo vão sem compressão.
+    COMPRESSION_MINIMUM_SIZE: int = 1000  # bytes
+    GZIP_COMPRESS_LEVEL: int = 6
+    BROTLI_ENABLED: bool = True
+    BROTLI_QUALITY: int = 5
+
+    # Operações em lote de posts: itens por transação e máximo por requisição
+    BULK_CHUNK_SIZE: int = 500
+    BULK_MAX_ITEMS: int = 100_000
+
+    # Exportação NDJSON de usuários: linhas buscadas do DB por lote
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Profiling sob demanda: com PROFILING_ENABLED, requisições com o header
+    # "X-Profile: 1" são perfiladas e o resultado é salvo em PROFILE_DIR.
+    PROFILING_ENABLED: bool = False
+    PROFILE_DIR: str = "profiles"
+
+    # Deploy com vários workers: a migração do schema roda no startup de cada
+    # processo (protegida por lock) a menos que MIGRATE_ON_STARTUP seja falso,
+    # como faz `python -m core.server`, que migra uma única vez antes de subir
+    # os workers. WEB_CONCURRENCY=0 usa um worker por núcleo.
+    MIGRATE_ON_STARTUP: bool = True
+    WEB_CONCURRENCY: int = 0
+
+    # Proteção contra sobrecarga (limites aplicados por router em main.py).
+    # Rate limit em token bucket: "N/second", "N/minute" ou "N/hour".
+    # RATE_LIMIT_BACKEND="redis" (em CACHE_URL) compartilha os buckets entre
+    # os workers; "memory" vale por processo.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_AUTH_IP: str = "30/minute"  # /auth/*, por IP
+    RATE_LIMIT_AUTH_ACCOUNT: str = "10/minute"  # tentativas de login por conta
+    RATE_LIMIT_API_IP: str = "100/second"  # /posts e /users, por IP
+    # Admissão (por processo): requisições simultâneas, fila e espera máxima
+    ADMISSION_AUTH_CONCURRENCY: int = 16
+    ADMISSION_AUTH_QUEUE: int = 64
+    ADMISSION_API_CONCURRENCY: int = 256
+    ADMISSION_API_QUEUE: int = 1024
+    ADMISSION_QUEUE_TIMEOUT: float = 2.0  # segundos
 
     # Database Settings
     DATABASE_URL: str = "sqlite:///blog.db"
+    DB_ECHO: bool = False  # Loga todo SQL executado (somente para debug)
+
+    # Réplicas de leitura (lista JSON de URLs). As rotas GET leem de uma
+    # réplica escolhida por REPLICA_STRATEGY ("round_robin" ou "least_loaded");
+    # réplica que falha ao conectar fica fora por REPLICA_RETRY_SECONDS e a
+    # leitura cai no primário. Depois de uma escrita, o cliente lê do primário
+    # por READ_YOUR_WRITES_SECONDS (cookie), para não ver dados atrasados.
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_STRATEGY: str = "round_robin"
+    REPLICA_RETRY_SECONDS: int = 30
+    READ_YOUR_WRITES_SECONDS: int = 5
+
+    # Pool de conexões (ignorado para SQLite em memória)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # segundos esperando uma conexão livre
+    DB_POOL_RECYCLE: int = 1800  # segundos até reciclar uma conexão
+    DB_POOL_PRE_PING: bool = True
+
+    # Ajustes do SQLite aplicados a cada nova conexão
+    SQLITE_JOURNAL_MODE: str = "WAL"  # leitores não bloqueiam o escritor
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # seguro com WAL e bem mais rápido que FULL
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # bytes
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
 
     # Configuração do Pydantic para carregar de um arquivo .env.
     # O Pydantic irá primeiro procurar variáveis de ambiente e, em seguida,
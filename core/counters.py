@@ -0,0 +1,106 @@
+"""
+Contador desnormalizado de posts por autor (User.post_count).
+
+As rotas de escrita ajustam o contador na mesma transação em que criam ou
+removem posts (`adjust_post_counts`), então a leitura nunca precisa de um
+COUNT(*). Qualquer divergência (escritas fora da API, bancos antigos) é
+corrigida por `reconcile_post_counts`, que recalcula os contadores em lotes
+de usuários:
+
+    python -m core.counters --reconcile
+"""
+
+import argparse
+from typing import Dict
+
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models import Post, User
+
+_user = User.__table__
+
+# UPDATE relativo (post_count = post_count + :delta): sem ler o valor atual,
+# então escritas concorrentes no mesmo autor não se sobrescrevem
+_adjust_statement = (
+    update(_user)
+    .where(_user.c.id == bindparam("author_id"))
+    .values(post_count=_user.c.post_count + bindparam("delta"))
+)
+
+
+async def adjust_post_counts(db: AsyncSession, deltas: Dict[int, int]):
+    """
+    Soma `delta` ao contador de cada autor (executemany). Deve rodar antes do
+    commit da escrita que o originou, na mesma transação.
+    """
+    params = [
+        {"author_id": author_id, "delta": delta}
+        for author_id, delta in deltas.items()
+        if delta
+    ]
+    if params:
+        await db.exec(_adjust_statement, params=params)
+
+
+def reconcile_post_counts(engine: Engine, batch_size: int = 1000) -> int:
+    """
+    Recalcula User.post_count a partir da tabela post, em lotes de usuários
+    (cada lote em uma transação curta, sem travar a tabela inteira).
+    Retorna quantos usuários estavam com o contador errado.
+
+    A contagem e a correção de cada lote são um único UPDATE com subquery:
+    um post criado ou removido entre uma leitura e a gravação do valor
+    absoluto seria perdido (READ COMMITTED) ou faria o lote falhar (SQLite).
+    """
+    actual = (
+        select(func.count())
+        .select_from(Post.__table__)
+        .where(Post.author_id == _user.c.id)
+        .scalar_subquery()
+    )
+    fixed = 0
+    last_id = 0
+    while True:
+        # 1. Próximo lote de usuários (keyset pelo id), em uma leitura curta
+        with Session(engine) as session:
+            ids = session.exec(
+                select(User.id)
+                .where(User.id > last_id)
+                .order_by(User.id)
+                .limit(batch_size)
+            ).all()
+        if not ids:
+            return fixed
+        last_id = ids[-1]
+
+        # 2. Corrigir só quem divergiu, contando pelo índice (author_id, id)
+        with Session(engine) as session:
+            result = session.exec(
+                update(_user)
+                .where(_user.c.id.in_(ids), _user.c.post_count != actual)
+                .values(post_count=actual)
+            )
+            session.commit()
+        fixed += result.rowcount
+
+
+if __name__ == "__main__":
+    from core.database import engine
+
+    parser = argparse.ArgumentParser(description="Contadores de posts por autor.")
+    parser.add_argument(
+        "--reconcile",
+        action="store_true",
+        help="Recalcula User.post_count a partir da tabela post.",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.reconcile:
+        fixed = reconcile_post_counts(engine, args.batch_size)
+        print(f"Contadores corrigidos: {fixed}.")
+    else:
+        parser.print_help()
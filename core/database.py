@@ -1,16 +1,392 @@
+import os
+import tempfile
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import List, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import event, inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.schema import CreateColumn
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from core.config import settings
+from core.metrics import collect_pool_stats, instrument_engine
+from core.search import create_search_index
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem flock, a migração roda sem lock
+    fcntl = None
+
+# Drivers assíncronos usados quando a DATABASE_URL não especifica um.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    """
+    Converte a URL síncrona (ex.: sqlite:///blog.db) para o driver assíncrono
+    equivalente (sqlite+aiosqlite:///blog.db). URLs já assíncronas são mantidas.
+    """
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def engine_options(url: str) -> dict:
+    """
+    Opções do engine a partir das configurações. O SQLite em memória usa um
+    pool próprio (uma única conexão), que não aceita os parâmetros de pool.
+    """
+    options = {"echo": settings.DB_ECHO, "pool_pre_ping": settings.DB_POOL_PRE_PING}
+
+    parsed = make_url(url)
+    in_memory = parsed.database in (None, "", ":memory:")
+    if parsed.get_backend_name() == "sqlite" and in_memory:
+        return options
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Aplicado a cada nova conexão SQLite. Com WAL, leituras não esperam a
+    escrita em andamento terminar; busy_timeout faz o escritor aguardar o
+    lock em vez de falhar imediatamente com "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.close()
+
 
 sqlite_url = settings.DATABASE_URL
 
-engine = create_engine(sqlite_url, echo=True)
+# Engine síncrono: usado na criação das tabelas/índices e em scripts.
+engine = create_engine(sqlite_url, **engine_options(sqlite_url))
+
+# Engine assíncrono: usado pelas rotas da API.
+async_engine = create_async_engine(
+    to_async_url(sqlite_url), **engine_options(sqlite_url)
+)
+
+# Réplicas de leitura (assíncronas): usadas pelas rotas GET via get_read_session.
+replica_engines = [
+    create_async_engine(to_async_url(url), **engine_options(url))
+    for url in settings.DATABASE_REPLICA_URLS
+]
+
+for sync_engine in (engine, async_engine.sync_engine):
+    if sync_engine.dialect.name == "sqlite":
+        event.listen(sync_engine, "connect", set_sqlite_pragmas)
+for replica in replica_engines:
+    if replica.dialect.name == "sqlite":
+        event.listen(replica.sync_engine, "connect", set_sqlite_pragmas)
+
+# Métricas: statements/tempo de banco por requisição e estado dos pools
+_instrumented = [("sync", engine), ("async", async_engine.sync_engine)]
+_instrumented += [
+    (f"replica{index}", replica.sync_engine)
+    for index, replica in enumerate(replica_engines)
+]
+for name, instrumented in _instrumented:
+    instrument_engine(instrumented)
+    collect_pool_stats(name, instrumented)
+
+
+def _reset_pools_after_fork():
+    """
+    Um worker criado por fork (ex.: gunicorn --preload) herda os pools do
+    processo pai. As conexões herdadas não podem ser usadas pelos dois
+    processos: o filho descarta os pools, sem fechá-las, e abre as suas.
+    """
+    for _, instrumented in _instrumented:
+        instrumented.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+
+async def dispose_engines():
+    """Fecha as conexões dos pools (chamado no shutdown de cada worker)."""
+    for replica in replica_engines:
+        await replica.dispose()
+    await async_engine.dispose()
+    engine.dispose()
+
+
+async def check_database():
+    """Executa um SELECT 1; levanta a exceção do driver se o banco não responde."""
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+# Chave do advisory lock do PostgreSQL usado na migração (valor arbitrário).
+MIGRATION_LOCK_KEY = 7_341_209
+
+
+def _migration_lock_path() -> str:
+    database = make_url(sqlite_url).database
+    if engine.dialect.name == "sqlite" and database not in (None, "", ":memory:"):
+        return f"{database}.migrate.lock"
+    return os.path.join(tempfile.gettempdir(), "blog-api.migrate.lock")
+
+
+@contextmanager
+def migration_lock():
+    """
+    Serializa a migração entre processos: com N workers subindo juntos, só um
+    executa o DDL por vez e os demais encontram o schema já atualizado.
+    PostgreSQL usa um advisory lock; os outros bancos, um flock em arquivo
+    (que só vale para processos na mesma máquina).
+    """
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            params = {"key": MIGRATION_LOCK_KEY}
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), params)
+            try:
+                yield
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), params)
+        return
+
+    if fcntl is None:
+        yield
+        return
+
+    with open(_migration_lock_path(), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def migrate():
+    """
+    Cria/atualiza o schema (tabelas, colunas, índices e índice de busca).
+    Idempotente e protegido por `migration_lock`, pode rodar em cada worker.
+    """
+    import models  # noqa: F401  registra as tabelas no metadata
+
+    with migration_lock():
+        added = create_db_and_tables()
 
+        # Coluna recém-criada com o valor padrão: calcula os contadores reais
+        if "user.post_count" in added:
+            from core.counters import reconcile_post_counts
 
-def create_db_and_tables():
+            reconcile_post_counts(engine)
+
+
+def create_db_and_tables() -> List[str]:
+    """Cria/atualiza o schema; retorna as colunas adicionadas ("tabela.coluna")."""
     SQLModel.metadata.create_all(engine)
+    added = _add_missing_columns()
+    _create_missing_indexes()
+    create_search_index(engine)
+    return added
+
+
+def _add_missing_columns() -> List[str]:
+    """
+    O `create_all` não altera tabelas existentes. Colunas novas dos models são
+    adicionadas com ALTER TABLE; por isso elas precisam aceitar NULL ou ter
+    um `server_default` para preencher as linhas antigas.
+    """
+    added = []
+    inspector = inspect(engine)
+    for table in SQLModel.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable and column.server_default is None:
+                raise RuntimeError(
+                    f"Coluna {table.name}.{column.name} precisa ser opcional ou "
+                    "ter server_default para ser adicionada a um banco existente."
+                )
+
+            with engine.begin() as conn:
+                conn.execute(text(add_column_ddl(column, engine.dialect)))
+            added.append(f"{table.name}.{column.name}")
+    return added
+
+
+def add_column_ddl(column, dialect) -> str:
+    """
+    ALTER TABLE ... ADD COLUMN para `column`. O nome da tabela passa pelo
+    quoting do dialeto: "user" é palavra reservada no PostgreSQL.
+    """
+    table = dialect.identifier_preparer.format_table(column.table)
+    ddl = CreateColumn(column).compile(dialect=dialect)
+    return f"ALTER TABLE {table} ADD COLUMN {ddl}"
+
+
+def _create_missing_indexes():
+    """
+    O `create_all` só cria índices junto com tabelas novas. Para bancos já
+    existentes (ex.: blog.db), criamos aqui os índices declarados nos models
+    que ainda não existem.
+    """
+    inspector = inspect(engine)
+    for table in SQLModel.metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(engine)
 
 
 def get_session():
     with Session(engine) as session:
         yield session
+
+
+# Cookie que, depois de uma escrita, manda as leituras do cliente ao primário
+READ_YOUR_WRITES_COOKIE = "read_primary"
+
+
+async def get_async_session(response: Response):
+    # expire_on_commit=False: depois do commit os objetos continuam legíveis
+    # sem disparar um novo SELECT (lazy loading não é permitido em async).
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        if replica_engines:
+            # Read-your-writes: após um commit, as próximas leituras deste
+            # cliente vão ao primário enquanto as réplicas podem estar atrás
+            event.listen(
+                session.sync_session,
+                "after_commit",
+                lambda _: response.set_cookie(
+                    READ_YOUR_WRITES_COOKIE,
+                    "1",
+                    max_age=settings.READ_YOUR_WRITES_SECONDS,
+                    httponly=True,
+                    samesite="lax",
+                ),
+            )
+        yield session
+
+
+class ReplicaRouter:
+    """
+    Escolhe a réplica de cada leitura. Só entram na escolha as réplicas
+    saudáveis: uma réplica que falhou ao conectar fica de fora por
+    `retry_seconds`. Estratégias:
+
+    - round_robin: alterna entre as réplicas, uma por sessão;
+    - least_loaded: a réplica com menos sessões abertas neste processo.
+    """
+
+    def __init__(self, count: int, strategy: str, retry_seconds: int):
+        if strategy not in ("round_robin", "least_loaded"):
+            raise ValueError(f"REPLICA_STRATEGY inválida: {strategy!r}")
+        self.strategy = strategy
+        self.retry_seconds = retry_seconds
+        self.in_use = [0] * count
+        self._down_until = [0.0] * count
+        self._next = 0
+
+    def candidates(self) -> List[int]:
+        """Réplicas saudáveis, na ordem em que devem ser tentadas."""
+        now = time.monotonic()
+        healthy = [i for i, until in enumerate(self._down_until) if until <= now]
+        if self.strategy == "least_loaded":
+            return sorted(healthy, key=lambda index: self.in_use[index])
+
+        if not healthy:
+            return healthy
+        start = self._next % len(healthy)
+        self._next += 1
+        return healthy[start:] + healthy[:start]
+
+    def mark_down(self, index: int):
+        self._down_until[index] = time.monotonic() + self.retry_seconds
+
+
+replica_router = ReplicaRouter(
+    len(replica_engines), settings.REPLICA_STRATEGY, settings.REPLICA_RETRY_SECONDS
+)
+
+
+async def _connect_for_read(primary: bool) -> Tuple[AsyncConnection, Optional[int]]:
+    """
+    Abre a conexão da leitura: na réplica escolhida ou, se `primary`, se não
+    houver réplicas ou se todas falharem, no primário.
+    """
+    if not primary:
+        for index in replica_router.candidates():
+            try:
+                return await replica_engines[index].connect(), index
+            except (SQLAlchemyError, OSError):
+                replica_router.mark_down(index)
+    return await async_engine.connect(), None
+
+
+@asynccontextmanager
+async def read_connection(primary: bool = False):
+    """Conexão somente leitura (réplica com fallback para o primário)."""
+    conn, index = await _connect_for_read(primary)
+    if index is not None:
+        replica_router.in_use[index] += 1
+    try:
+        yield conn
+    finally:
+        if index is not None:
+            replica_router.in_use[index] -= 1
+        await conn.close()
+
+
+async def get_read_session(request: Request):
+    """
+    Sessão para rotas GET: lê de uma réplica, exceto logo depois de uma
+    escrita do próprio cliente (cookie de read-your-writes).
+    """
+    if not replica_engines:
+        # Sem réplicas: sessão comum, que só conecta se a rota consultar o
+        # banco (um acerto no cache de respostas não usa conexão)
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+        return
+
+    # Com réplicas a conexão é aberta aqui, para que a falha de uma réplica
+    # caia no primário antes de a rota começar a consultar
+    primary = READ_YOUR_WRITES_COOKIE in request.cookies
+    async with read_connection(primary) as conn:
+        info = {
+            "read_your_writes": primary,
+            "replica": conn.sync_engine is not async_engine.sync_engine,
+        }
+        async with AsyncSession(
+            bind=conn, expire_on_commit=False, info=info
+        ) as session:
+            yield session
+
+
+def reads_own_writes(session: AsyncSession) -> bool:
+    """
+    A sessão de leitura é de um cliente que acabou de escrever (cookie de
+    read-your-writes): a rota não deve responder do cache, que pode ter
+    uma versão anterior à escrita.
+    """
+    return session.info.get("read_your_writes", False)
+
+
+def reads_from_replica(session: AsyncSession) -> bool:
+    """A sessão de leitura está conectada a uma réplica (que pode estar atrás)."""
+    return session.info.get("replica", False)
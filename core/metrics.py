@@ -0,0 +1,267 @@
+"""
+Métricas da aplicação no formato texto do Prometheus, sem dependências
+externas. As métricas são por processo: com vários workers, cada um expõe
+as suas e o Prometheus agrega.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, labels)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, *labels: str, value: float):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Iterable[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> (contagem por bucket, soma, total)
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *labels: str):
+        with self._lock:
+            data = self._values.get(labels)
+            if data is None:
+                data = self._values[labels] = [[0] * len(self.buckets), 0.0, 0]
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                data[0][index] += 1
+            data[1] += value
+            data[2] += 1
+
+    @contextmanager
+    def time(self, *labels: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        names = self.labels + ("le",)
+        for labels, (counts, total_sum, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(names, labels + (bound,))} "
+                    f"{cumulative}"
+                )
+            lines.append(
+                f"{self.name}_bucket{_format_labels(names, labels + ('+Inf',))} {total}"
+            )
+            label_text = _format_labels(self.labels, labels)
+            lines.append(f"{self.name}_sum{label_text} {total_sum}")
+            lines.append(f"{self.name}_count{label_text} {total}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Função chamada antes de cada renderização (ex.: atualizar gauges)."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# --- HTTP ---
+http_requests_total = registry.register(
+    Counter(
+        "http_requests_total",
+        "Requisições atendidas.",
+        ("method", "route", "status"),
+    )
+)
+http_request_duration = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Latência das requisições por rota.",
+        ("method", "route"),
+    )
+)
+http_requests_in_flight = registry.register(
+    Gauge("http_requests_in_flight", "Requisições em andamento.")
+)
+
+# --- Banco de dados ---
+db_queries_per_request = registry.register(
+    Histogram(
+        "db_queries_per_request",
+        "Statements SQL executados por requisição.",
+        ("method", "route"),
+        buckets=COUNT_BUCKETS,
+    )
+)
+db_time_per_request = registry.register(
+    Histogram(
+        "db_time_per_request_seconds",
+        "Tempo gasto no banco por requisição.",
+        ("method", "route"),
+    )
+)
+db_pool_connections = registry.register(
+    Gauge(
+        "db_pool_connections",
+        "Conexões do pool por estado.",
+        ("engine", "state"),
+    )
+)
+
+# --- Segurança ---
+argon2_duration = registry.register(
+    Histogram(
+        "argon2_duration_seconds",
+        "Tempo de CPU gasto no Argon2 (sem contar a fila do pool).",
+        ("operation",),
+    )
+)
+jwt_duration = registry.register(
+    Histogram(
+        "jwt_duration_seconds", "Tempo gasto codificando/validando JWT.", ("operation",)
+    )
+)
+
+# --- Proteção contra sobrecarga ---
+requests_rejected = registry.register(
+    Counter(
+        "requests_rejected_total",
+        "Requisições recusadas por rate limit (429) ou admissão (503).",
+        ("policy", "reason"),
+    )
+)
+admission_requests = registry.register(
+    Gauge(
+        "admission_requests",
+        "Requisições em execução/na fila por controle de admissão.",
+        ("controller", "state"),
+    )
+)
+
+# --- Caches ---
+cache_events = registry.register(
+    Gauge("cache_events", "Acertos/erros acumulados por cache.", ("cache", "result"))
+)
+
+
+# Consultas da requisição atual: [quantidade, tempo em segundos]
+_request_db_stats: ContextVar[Optional[list]] = ContextVar(
+    "request_db_stats", default=None
+)
+
+
+def start_request_tracking() -> list:
+    stats = [0, 0.0]
+    _request_db_stats.set(stats)
+    return stats
+
+
+def instrument_engine(engine):
+    """
+    Conta statements e tempo de banco da requisição corrente via eventos do
+    SQLAlchemy (para engines assíncronos, passe `async_engine.sync_engine`).
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        stats = _request_db_stats.get()
+        if stats is not None:
+            stats[0] += 1
+            stats[1] += time.perf_counter() - started
+
+
+def collect_pool_stats(name: str, engine):
+    def collect():
+        # engine.pool lido a cada coleta: dispose() troca o pool do engine
+        pool = engine.pool
+        # Nem todo pool expõe esses métodos (ex.: SQLite em memória)
+        for state in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, state, None)
+            if callable(method):
+                db_pool_connections.set(name, state, value=method())
+
+    registry.add_collector(collect)
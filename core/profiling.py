@@ -0,0 +1,69 @@
+import cProfile
+import os
+import re
+import time
+
+from fastapi import Request, Response, status
+from fastapi.responses import JSONResponse
+
+from core.config import settings
+
+# Um profiling por vez no processo: o cProfile é da thread inteira (pegaria
+# o trabalho das outras requisições e, no Python 3.12+, um segundo enable()
+# falha), e um perfil pegando o outro não serviria para nada
+_capture_running = False
+
+
+async def profile_request(request: Request, call_next) -> Response:
+    """
+    Executa a requisição sob um profiler e salva o resultado em PROFILE_DIR.
+    Usa o pyinstrument (entende async) se estiver instalado; senão o cProfile.
+    O caminho do arquivo gerado vai no header X-Profile-File. Enquanto um
+    profiling está em andamento, outra requisição com X-Profile recebe 409.
+    """
+    global _capture_running
+    if _capture_running:
+        return JSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content={"detail": "Já existe um profiling em andamento."},
+        )
+
+    _capture_running = True
+    try:
+        return await _profile(request, call_next)
+    finally:
+        _capture_running = False
+
+
+async def _profile(request: Request, call_next) -> Response:
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", request.url.path).strip("_") or "root"
+    name = f"{int(time.time() * 1000)}-{request.method}-{slug}"
+
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        Profiler = None
+
+    if Profiler is not None:
+        profiler = Profiler(async_mode="enabled")
+        profiler.start()
+        try:
+            response = await call_next(request)
+        finally:
+            profiler.stop()
+        path = os.path.join(settings.PROFILE_DIR, f"{name}.html")
+        with open(path, "w", encoding="utf-8") as output:
+            output.write(profiler.output_html())
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            response = await call_next(request)
+        finally:
+            profiler.disable()
+        path = os.path.join(settings.PROFILE_DIR, f"{name}.prof")
+        profiler.dump_stats(path)
+
+    response.headers["X-Profile-File"] = path
+    return response
@@ -0,0 +1,289 @@
+"""
+Proteção contra sobrecarga, aplicada como dependências de router (main.py):
+
+- `RateLimit`: token bucket por chave (IP do cliente...). Cada chave
+  acumula até `burst` fichas, repostas a `rate` por segundo; sem ficha, a
+  requisição recebe 429 com Retry-After. Backends em memória (por processo)
+  ou Redis (compartilhado entre workers).
+- `FailedLoginLimit`: o mesmo bucket por conta, gasto só por logins com
+  senha errada e consultado pela rota antes do Argon2.
+- `AdmissionController`: limita as requisições simultâneas de um grupo de
+  rotas. Acima do limite, até `max_queue` requisições esperam por uma vaga
+  por no máximo `queue_timeout` segundos; o resto recebe 503 com Retry-After
+  na hora, antes que a latência de todas as outras dispare.
+"""
+
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from core.config import settings
+from core.metrics import admission_requests, registry, requests_rejected
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600}
+
+
+def parse_rate(value: str) -> Tuple[float, int]:
+    """
+    "30/minute" -> (0.5 ficha por segundo, burst de 30).
+    """
+    try:
+        amount, period = value.split("/")
+        burst = int(amount)
+        return burst / _PERIODS[period.strip()], burst
+    except (KeyError, ValueError):
+        raise ValueError(
+            f"Limite inválido: {value!r} (use N/second, N/minute ou N/hour)"
+        ) from None
+
+
+class RateLimitBackend:
+    """
+    Interface dos backends. `consume` tira uma ficha do bucket da chave e
+    retorna 0 se conseguiu, ou quantos segundos faltam para haver uma;
+    `peek` responde o mesmo sem tirar a ficha.
+    """
+
+    async def consume(self, key: str, rate: float, burst: int) -> float:
+        return await self._update(key, rate, burst, take=True)
+
+    async def peek(self, key: str, rate: float, burst: int) -> float:
+        return await self._update(key, rate, burst, take=False)
+
+    async def _update(self, key: str, rate: float, burst: int, take: bool) -> float:
+        raise NotImplementedError
+
+    async def close(self):
+        """Libera conexões do backend (chamado no shutdown da aplicação)."""
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Buckets do processo, em LRU limitado a `max_keys` chaves (um bucket
+    descartado volta cheio, o que só beneficia quem ficou muito tempo
+    inativo). Sem await entre ler e gravar: atômico no event loop.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    async def _update(self, key: str, rate: float, burst: int, take: bool) -> float:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(burst), now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+
+        # Repõe as fichas do tempo passado desde a última requisição
+        tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1 if take else tokens
+            return 0.0
+        bucket[0] = tokens
+        return (1 - tokens) / rate
+
+
+# Token bucket atômico no Redis, com o relógio do próprio Redis
+_REDIS_TOKEN_BUCKET = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local take = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - take
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Buckets compartilhados entre workers. Depende do pacote `redis`
+    (opcional); em testes pode receber um cliente compatível.
+    """
+
+    def __init__(self, url: str, client=None, prefix: str = "ratelimit:"):
+        if client is None:
+            import redis.asyncio as redis
+
+            client = redis.Redis.from_url(url)
+        self._client = client
+        self._prefix = prefix
+        self._script = client.register_script(_REDIS_TOKEN_BUCKET)
+
+    async def _update(self, key: str, rate: float, burst: int, take: bool) -> float:
+        wait = await self._script(
+            keys=[self._prefix + key], args=[rate, burst, int(take)]
+        )
+        return float(wait)
+
+    async def close(self):
+        await self._client.aclose()
+
+
+def create_rate_limit_backend() -> RateLimitBackend:
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimitBackend(settings.CACHE_URL)
+    return MemoryRateLimitBackend()
+
+
+rate_limit_backend = create_rate_limit_backend()
+
+
+# --- Chaves dos buckets ---
+
+
+async def client_ip(request: Request) -> Optional[str]:
+    # Atrás de proxy, o uvicorn (proxy_headers) já troca pelo IP real
+    return request.client.host if request.client else None
+
+
+class RateLimit:
+    """
+    Dependência de rate limit. Limites com o mesmo `name` compartilham os
+    buckets (ex.: o mesmo limite por IP em vários routers).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: str,
+        key: Callable[[Request], Awaitable[Optional[str]]] = client_ip,
+        backend: Optional[RateLimitBackend] = None,
+    ):
+        self.name = name
+        self.rate, self.burst = parse_rate(limit)
+        self.key = key
+        self.backend = backend or rate_limit_backend
+
+    async def __call__(self, request: Request):
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        key = await self.key(request)
+        if key is None:
+            return
+
+        wait = await self.backend.consume(f"{self.name}:{key}", self.rate, self.burst)
+        if wait > 0:
+            raise _too_many_requests(self.name, wait)
+
+
+def _too_many_requests(name: str, wait: float) -> HTTPException:
+    requests_rejected.inc(name, "rate_limit")
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Muitas requisições. Tente novamente mais tarde.",
+        headers={"Retry-After": str(max(1, math.ceil(wait)))},
+    )
+
+
+class FailedLoginLimit:
+    """
+    Tentativas de login com senha errada por conta. A rota chama `check`
+    antes de verificar a senha (uma conta bloqueada não custa um Argon2) e
+    `record_failure` só quando a verificação falha: logins corretos não
+    gastam fichas, então ninguém bloqueia o dono da conta acertando a senha
+    por ele, apenas errando.
+    """
+
+    def __init__(
+        self, name: str, limit: str, backend: Optional[RateLimitBackend] = None
+    ):
+        self.name = name
+        self.rate, self.burst = parse_rate(limit)
+        self.backend = backend or rate_limit_backend
+
+    def _key(self, username: str) -> str:
+        return f"{self.name}:{username.strip().lower()}"
+
+    async def check(self, username: str):
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        wait = await self.backend.peek(self._key(username), self.rate, self.burst)
+        if wait > 0:
+            raise _too_many_requests(self.name, wait)
+
+    async def record_failure(self, username: str):
+        if settings.RATE_LIMIT_ENABLED:
+            await self.backend.consume(self._key(username), self.rate, self.burst)
+
+
+login_failures = FailedLoginLimit("auth_account", settings.RATE_LIMIT_AUTH_ACCOUNT)
+
+
+class AdmissionController:
+    """
+    Dependência que limita as requisições simultâneas de um grupo de rotas
+    (por processo). Quem não consegue vaga espera na fila; fila cheia ou
+    espera longa demais resultam em 503 com Retry-After.
+    """
+
+    def __init__(
+        self, name: str, max_concurrency: int, max_queue: int, queue_timeout: float
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self._slots = asyncio.Semaphore(max_concurrency)
+        registry.add_collector(self._collect)
+
+    def _collect(self):
+        admission_requests.set(self.name, "active", value=self.active)
+        admission_requests.set(self.name, "waiting", value=self.waiting)
+
+    def _reject(self, reason: str) -> HTTPException:
+        requests_rejected.inc(self.name, reason)
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor ocupado. Tente novamente em instantes.",
+            headers={"Retry-After": str(max(1, math.ceil(self.queue_timeout)))},
+        )
+
+    async def _acquire(self):
+        if not self._slots.locked():
+            await self._slots.acquire()
+            return
+
+        # 1. Sem vaga: entra na fila, se ainda couber
+        if self.waiting >= self.max_queue:
+            raise self._reject("queue_full")
+
+        # 2. Espera uma vaga por no máximo queue_timeout
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise self._reject("queue_timeout") from None
+        finally:
+            self.waiting -= 1
+
+    async def __call__(self):
+        await self._acquire()
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._slots.release()
@@ -0,0 +1,156 @@
+"""
+Busca full-text de posts usando SQLite FTS5.
+
+O índice `post_fts` é uma tabela virtual de "conteúdo externo": ela não duplica
+o texto dos posts, só guarda o índice invertido. Os triggers abaixo mantêm o
+índice sincronizado a cada INSERT, UPDATE e DELETE na tabela `post`.
+
+Para reconstruir o índice de um blog.db já existente:
+
+    python -m core.search --rebuild
+"""
+
+import argparse
+import html
+import re
+from typing import List, Optional
+
+from sqlalchemy import Engine, Float, Integer, String, text
+
+FTS_TABLE = "post_fts"
+
+_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, content,
+        content='post', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS post_fts_ai AFTER INSERT ON post BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS post_fts_ad AFTER DELETE ON post BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS post_fts_au AFTER UPDATE OF title, content ON post
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO {FTS_TABLE}(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+
+# Pesos do bm25 por coluna: um termo no título vale mais que no conteúdo.
+_RANK = f"bm25({FTS_TABLE}, 10.0, 1.0)"
+# O trecho é texto do post, sem escape: o FTS5 marca os termos com
+# caracteres de controle e `highlight_snippet` gera o HTML já escapado
+_MARK_START, _MARK_END = "\x02", "\x03"
+_SNIPPET = f"snippet({FTS_TABLE}, -1, char(2), char(3), '…', 16)"
+
+
+def is_supported(engine: Engine) -> bool:
+    return engine.dialect.name == "sqlite"
+
+
+def create_search_index(engine: Engine):
+    """
+    Cria a tabela FTS5 e os triggers (idempotente). Se a tabela acabou de
+    ser criada em um banco que já tem posts, o índice é populado.
+    """
+    if not is_supported(engine):
+        return
+
+    with engine.begin() as conn:
+        existed = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE},
+        ).first()
+        for statement in _DDL:
+            conn.execute(text(statement))
+        if not existed:
+            _rebuild(conn)
+
+
+def rebuild_search_index(engine: Engine):
+    """
+    Reconstrói o índice inteiro a partir da tabela `post`.
+    """
+    create_search_index(engine)
+    with engine.begin() as conn:
+        _rebuild(conn)
+
+
+def _rebuild(conn):
+    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def build_match_query(search: str) -> Optional[str]:
+    """
+    Converte o texto digitado pelo cliente em uma expressão MATCH segura:
+    cada palavra vira um termo entre aspas (AND implícito), então a sintaxe
+    do FTS5 (NEAR, OR, *, :) nunca é interpretada a partir da entrada do usuário.
+    """
+    terms: List[str] = re.findall(r"\w+", search)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def highlight_snippet(snippet: str) -> str:
+    """
+    Trecho devolvido pelo FTS5 -> HTML seguro: o texto do post é escapado e
+    só os termos encontrados ficam entre <mark> e </mark>.
+    """
+    return (
+        html.escape(snippet)
+        .replace(_MARK_START, "<mark>")
+        .replace(_MARK_END, "</mark>")
+    )
+
+
+def search_subquery(match: str):
+    """
+    Subquery com (id, rank, snippet) dos posts que casam com `match`
+    (gerado por `build_match_query`). Menor rank = mais relevante.
+    """
+    return (
+        text(
+            f"SELECT rowid AS id, {_RANK} AS rank, {_SNIPPET} AS snippet "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :query"
+        )
+        .bindparams(query=match)
+        .columns(id=Integer, rank=Float, snippet=String)
+        .subquery("fts")
+    )
+
+
+if __name__ == "__main__":
+    from core.database import engine
+
+    parser = argparse.ArgumentParser(
+        description="Índice de busca full-text dos posts."
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Reconstrói o índice a partir da tabela post.",
+    )
+    args = parser.parse_args()
+
+    if not is_supported(engine):
+        parser.error("A busca full-text só está disponível com SQLite (FTS5).")
+    if args.rebuild:
+        rebuild_search_index(engine)
+        print("Índice de busca reconstruído.")
+    else:
+        parser.print_help()
@@ -1,17 +1,43 @@
-from datetime import datetime, timedelta
-from typing import Optional
+import asyncio
+import hashlib
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Optional, Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from core.cache import TTLCache
 from core.config import settings
+from core.metrics import argon2_duration, jwt_duration
+from core.tokens import InvalidTokenError, create_denylist, create_jwt_backend
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token", scheme_name="BearerAuth")
 
+# Chave do JWT processada uma única vez (ver core.tokens)
+jwt_backend = create_jwt_backend()
+
+# jti de tokens revogados (logout e refresh tokens já usados)
+token_denylist = create_denylist()
+
+# Tokens já verificados: hash do token -> claims
+token_cache = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL)
+
+# Resposta de token inválido: detalhe e headers montados uma vez
+_CREDENTIALS_DETAIL = "Não foi possível validar as credenciais"
+_CREDENTIALS_HEADERS = {"WWW-Authenticate": "Bearer"}
+
 
 def get_password_hash(password: str):
     return pwd_context.hash(password)
@@ -21,51 +47,205 @@ def verify_password(plain_password: str, hashed_password: str):
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_rehash(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica a senha e, se o hash foi gerado com parâmetros antigos do Argon2,
+    devolve um novo hash com os parâmetros atuais (ou None se não precisar).
+    """
+    if not pwd_context.verify(plain_password, hashed_password):
+        return False, None
+    if pwd_context.needs_update(hashed_password):
+        return True, pwd_context.hash(plain_password)
+    return True, None
+
+
+def _timed(func, *args):
+    # Mede só o Argon2 em si, sem o tempo de espera na fila do pool
+    with argon2_duration.time(func.__name__):
+        return func(*args)
+
+
+class HashingPool:
+    """
+    Executor dedicado ao Argon2. O argon2-cffi libera o GIL durante o hash,
+    então threads bastam para usar vários núcleos sem travar o event loop.
+    O número de operações pendentes é limitado: acima do limite respondemos
+    503 em vez de acumular uma fila que derrubaria a latência das outras rotas.
+
+    As threads são criadas no primeiro uso; depois de `shutdown` (fim do
+    lifespan), o próximo uso cria um executor novo.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="argon2"
+            )
+        return self._executor
+
+    async def run(self, func, *args):
+        if self.pending >= self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servidor ocupado. Tente novamente em instantes.",
+                headers={"Retry-After": "1"},
+            )
+
+        # A vaga acompanha o job no executor, não quem espera por ele: se a
+        # requisição é cancelada (cliente desconectou), o Argon2 que já
+        # começou continua ocupando a thread até terminar
+        loop = asyncio.get_running_loop()
+        job = self._get_executor().submit(_timed, func, *args)
+        self.pending += 1
+        job.add_done_callback(lambda _: self._job_done(loop))
+        return await asyncio.wrap_future(job, loop=loop)
+
+    def _job_done(self, loop: asyncio.AbstractEventLoop):
+        # Chamado na thread do executor: `pending` só muda no event loop
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:  # event loop já encerrado
+            pass
+
+    def _release(self):
+        self.pending -= 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        # Jobs abandonados não liberam a vaga no event loop que já acabou
+        self.pending = 0
+
+
+hashing_pool = HashingPool(settings.HASH_WORKERS, settings.HASH_MAX_PENDING)
+
+
+async def hash_password_async(password: str) -> str:
+    return await hashing_pool.run(get_password_hash, password)
+
+
+async def verify_and_rehash_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    return await hashing_pool.run(verify_and_rehash, plain_password, hashed_password)
+
+
+def _create_token(data: dict, token_type: str, expires_delta: timedelta) -> str:
+    now = int(time.time())
+    claims = {
+        **data,
+        "type": token_type,
+        "jti": uuid.uuid4().hex,  # identifica o token na denylist
+        "iat": now,
+        "exp": now + int(expires_delta.total_seconds()),
+    }
+    with jwt_duration.time("encode"):
+        return jwt_backend.encode(claims)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """
     Gera um token JWT com dados do usuário e tempo de expiração.
     """
+    if expires_delta is None:
+        expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return _create_token(data, "access", expires_delta)
+
+
+def create_refresh_token(data: dict) -> str:
+    """
+    Gera o refresh token, de vida longa, trocado por um novo par de tokens
+    em POST /auth/refresh.
+    """
+    expires_delta = timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+    return _create_token(data, "refresh", expires_delta)
+
 
-    to_encode = data.copy()
+def _token_key(token: str) -> bytes:
+    # O cache guarda o hash do token, não a credencial em si
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
 
-    # 1. Definir tempo de expiração (exp)
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
-    to_encode.update({"exp": expire})
 
-    # 2. Codificar o token
-    encoded_jwt = jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGOTITHM
+def _credentials_error() -> HTTPException:
+    # Uma instância por falha: compartilhada, ela acumularia __traceback__ e
+    # __context__ de requisições concorrentes
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=_CREDENTIALS_DETAIL,
+        headers=_CREDENTIALS_HEADERS,
     )
 
-    return encoded_jwt
+
+def decode_token(token: str, token_type: str = "access") -> dict:
+    """
+    Valida o JWT e devolve as claims. Tokens verificados recentemente vêm do
+    cache, sem nova verificação de assinatura. Levanta 401 se o token for
+    inválido, expirado ou de outro tipo.
+    """
+    # 1. Token já validado recentemente: pula a verificação da assinatura
+    key = _token_key(token)
+    claims = token_cache.get(key)
+    if claims is None:
+        try:
+            # 2. Verificar assinatura e expiração
+            with jwt_duration.time("decode"):
+                claims = jwt_backend.decode(token)
+        except InvalidTokenError:
+            raise _credentials_error() from None
+
+        # 3. Guardar no cache, nunca além da expiração do próprio token
+        token_cache.set(key, claims, ttl=claims.get("exp", 0) - time.time())
+
+    # Tokens emitidos antes do refresh token não têm "type": são de acesso
+    if claims.get("type", "access") != token_type or claims.get("sub") is None:
+        raise _credentials_error()
+    return claims
+
+
+async def is_revoked(claims: dict) -> bool:
+    jti = claims.get("jti")
+    return jti is not None and await token_denylist.contains(jti)
+
+
+async def revoke_token(claims: dict):
+    """Coloca o token na denylist até o seu `exp`."""
+    jti = claims.get("jti")
+    if jti is not None:
+        await token_denylist.add(jti, claims["exp"])
 
 
-def get_current_user_email(token: str = Depends(oauth2_scheme)) -> str:
+async def revoke_token_once(claims: dict) -> bool:
     """
-    Decodifica e valida o JWT, retornando o email do usuário (subject).
+    Revoga o token se ele ainda não estava revogado, atomicamente; False se
+    já estava (ex.: o mesmo refresh token usado em duas requisições).
     """
+    jti = claims.get("jti")
+    if jti is None:
+        return True
+    return await token_denylist.add_if_absent(jti, claims["exp"])
+
+
+async def get_current_token(token: str = Depends(oauth2_scheme)) -> dict:
+    """
+    Claims do access token da requisição (válido e não revogado).
+    """
+    claims = decode_token(token, "access")
+    if await is_revoked(claims):
+        raise _credentials_error()
+    return claims
 
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Não foi possível validar as credenciais",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
 
-    try:
-        # 1. Decodificar o token
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGOTITHM]
-        )
-
-        # 2. Extrair o 'subject' (email)
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        return username
-    except JWTError:
-        raise credentials_exception
+async def get_current_user_email(claims: dict = Depends(get_current_token)) -> str:
+    """
+    Decodifica e valida o JWT, retornando o email do usuário (subject).
+    """
+    return claims["sub"]
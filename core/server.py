@@ -0,0 +1,90 @@
+"""
+Ponto de entrada de produção: aplica a migração do schema uma única vez e
+sobe o uvicorn com um worker por núcleo (ou --workers / WEB_CONCURRENCY).
+
+    python -m core.server --host 0.0.0.0 --port 8000
+    python -m core.server --migrate-only   # só a migração (ex.: job de deploy)
+
+Os workers são processos novos que importam `main:app` e criam os próprios
+engines; como a migração já rodou aqui, eles sobem com MIGRATE_ON_STARTUP
+desligado e não disputam o DDL.
+"""
+
+import argparse
+import os
+import sys
+
+
+def default_workers() -> int:
+    from core.config import settings
+
+    return settings.WEB_CONCURRENCY or os.cpu_count() or 1
+
+
+def shared_state_warning(workers: int) -> str:
+    """
+    Aviso para vários workers com estado só em memória: cada processo teria
+    o próprio cache de respostas (uma escrita em um worker não invalida os
+    outros, que servem dados antigos por até CACHE_TTL) e a própria denylist
+    (um logout só valeria no worker que o recebeu).
+    """
+    from core.config import settings
+
+    if workers <= 1 or settings.CACHE_BACKEND != "memory":
+        return ""
+    return (
+        f"AVISO: {workers} workers com CACHE_BACKEND=memory. Cada worker tem o "
+        "próprio cache de respostas e a própria denylist de tokens: escritas "
+        f"podem não aparecer por até {settings.CACHE_TTL}s nos outros workers "
+        "e um logout só vale no worker que o recebeu. Use CACHE_BACKEND=redis "
+        "(ou CACHE_BACKEND=none) em produção."
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor da API (multi-worker).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Número de processos (padrão: WEB_CONCURRENCY ou um por núcleo).",
+    )
+    parser.add_argument(
+        "--migrate-only",
+        action="store_true",
+        help="Aplica a migração do schema e sai.",
+    )
+    args = parser.parse_args()
+
+    from core.database import engine, migrate
+
+    # 1. Migração única, antes de existir qualquer worker
+    migrate()
+    engine.dispose()
+    if args.migrate_only:
+        print("Schema atualizado.")
+        return
+
+    # 2. Workers herdam o ambiente: não repetem a migração
+    import uvicorn
+
+    workers = args.workers or default_workers()
+    warning = shared_state_warning(workers)
+    if warning:
+        print(warning, file=sys.stderr)
+
+    os.environ["MIGRATE_ON_STARTUP"] = "false"
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        proxy_headers=True,
+        log_level="info",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Backends de JWT e denylist de tokens revogados.
+
+Os backends recebem o segredo uma única vez e guardam a chave já
+processada, em vez de deixar a biblioteca reconstruí-la a cada
+encode/decode. `JWT_BACKEND=auto` usa o backend "hmac" para algoritmos HS*
+(HMAC do hashlib, em C, e orjson) e o python-jose para os demais; veja
+`python -m benchmarks.jwt_verify`.
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import time
+from typing import Dict
+
+import orjson
+
+from core.config import settings
+
+
+class InvalidTokenError(Exception):
+    """Token com assinatura, formato ou validade inválidos."""
+
+
+class JWTBackend:
+    """
+    Interface dos backends de JWT. `decode` valida assinatura, algoritmo e
+    `exp` e levanta InvalidTokenError em qualquer falha.
+    """
+
+    name = "base"
+
+    def encode(self, claims: dict) -> str:
+        raise NotImplementedError
+
+    def decode(self, token: str) -> dict:
+        raise NotImplementedError
+
+
+def _b64decode(segment: str) -> bytes:
+    """
+    base64url sem padding, só na forma canônica (a que `_b64encode` gera):
+    padding, caracteres fora do alfabeto ou bits sobrando no último
+    caractere dariam outras grafias válidas para o mesmo token.
+    """
+    padded = segment + "=" * (-len(segment) % 4)
+    data = base64.b64decode(padded, altchars=b"-_", validate=True)
+    if _b64encode(data).decode("ascii") != segment:
+        raise ValueError("base64url não canônico.")
+    return data
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+class HMACBackend(JWTBackend):
+    """
+    JWT assinado com HMAC (HS256/HS384/HS512) verificado direto com o hmac
+    da biblioteca padrão. Aceita só o algoritmo configurado (o "alg" do
+    header não escolhe nada) e valida `exp` e `nbf` quando presentes.
+    """
+
+    name = "hmac"
+    _DIGESTS = {
+        "HS256": hashlib.sha256,
+        "HS384": hashlib.sha384,
+        "HS512": hashlib.sha512,
+    }
+
+    def __init__(self, secret: str, algorithm: str):
+        if algorithm not in self._DIGESTS:
+            raise ValueError(f"Algoritmo não suportado pelo backend hmac: {algorithm}")
+        self._algorithm = algorithm
+        self._digest = self._DIGESTS[algorithm]
+        self._key = secret.encode("utf-8")
+        header = orjson.dumps({"alg": algorithm, "typ": "JWT"})
+        self._header = _b64encode(header)
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        return hmac.new(self._key, signing_input, self._digest).digest()
+
+    def encode(self, claims: dict) -> str:
+        signing_input = self._header + b"." + _b64encode(orjson.dumps(claims))
+        signature = _b64encode(self._sign(signing_input))
+        return (signing_input + b"." + signature).decode("ascii")
+
+    def decode(self, token: str) -> dict:
+        try:
+            # 1. Assinatura, calculada sobre header.payload como recebidos
+            if token.count(".") != 2:
+                raise ValueError("O token deve ter três partes.")
+            signing_input, _, signature = token.rpartition(".")
+            header_segment, _, payload_segment = signing_input.partition(".")
+            expected = self._sign(signing_input.encode("ascii"))
+            if not hmac.compare_digest(expected, _b64decode(signature)):
+                raise InvalidTokenError("Assinatura inválida.")
+
+            # 2. Header e claims
+            header = orjson.loads(_b64decode(header_segment))
+            claims = orjson.loads(_b64decode(payload_segment))
+        except (ValueError, binascii.Error) as exc:
+            raise InvalidTokenError(str(exc)) from None
+        if not isinstance(header, dict) or header.get("alg") != self._algorithm:
+            raise InvalidTokenError("Algoritmo inválido.")
+        if not isinstance(claims, dict):
+            raise InvalidTokenError("Claims inválidas.")
+
+        # 3. Validade
+        now = time.time()
+        exp, nbf = claims.get("exp"), claims.get("nbf")
+        if exp is not None and (not isinstance(exp, (int, float)) or exp <= now):
+            raise InvalidTokenError("Token expirado.")
+        if nbf is not None and (not isinstance(nbf, (int, float)) or nbf > now):
+            raise InvalidTokenError("Token ainda não é válido.")
+        return claims
+
+
+class PyJWTBackend(JWTBackend):
+    name = "pyjwt"
+
+    def __init__(self, secret: str, algorithm: str):
+        import jwt
+
+        self._jwt = jwt
+        self._algorithms = [algorithm]
+        self._algorithm = algorithm
+        # Chave simétrica em formato JWK: o PyJWT usa o objeto preparado
+        # diretamente, sem refazer o prepare_key em cada chamada
+        k = base64.urlsafe_b64encode(secret.encode("utf-8")).rstrip(b"=")
+        self._key = jwt.PyJWK({"kty": "oct", "k": k.decode("ascii")}, algorithm)
+
+    def encode(self, claims: dict) -> str:
+        return self._jwt.encode(claims, self._key, algorithm=self._algorithm)
+
+    def decode(self, token: str) -> dict:
+        try:
+            return self._jwt.decode(token, self._key, algorithms=self._algorithms)
+        except self._jwt.PyJWTError as exc:
+            raise InvalidTokenError(str(exc)) from None
+
+
+class JoseBackend(JWTBackend):
+    name = "jose"
+
+    def __init__(self, secret: str, algorithm: str):
+        from jose import JWTError, jwk, jwt
+
+        self._jwt = jwt
+        self._error = JWTError
+        self._algorithm = algorithm
+        # O jose aceita um objeto Key pronto e, assim, não o reconstrói
+        self._key = jwk.construct(secret, algorithm)
+
+    def encode(self, claims: dict) -> str:
+        return self._jwt.encode(claims, self._key, algorithm=self._algorithm)
+
+    def decode(self, token: str) -> dict:
+        try:
+            return self._jwt.decode(token, self._key, algorithms=self._algorithm)
+        except self._error as exc:
+            raise InvalidTokenError(str(exc)) from None
+
+
+BACKENDS = {
+    backend.name: backend for backend in (HMACBackend, PyJWTBackend, JoseBackend)
+}
+
+
+def create_jwt_backend() -> JWTBackend:
+    secret, algorithm = settings.SECRET_KEY, settings.ALGOTITHM
+    if settings.JWT_BACKEND in BACKENDS:
+        return BACKENDS[settings.JWT_BACKEND](secret, algorithm)
+    if settings.JWT_BACKEND == "auto":
+        if algorithm in HMACBackend._DIGESTS:
+            return HMACBackend(secret, algorithm)
+        return JoseBackend(secret, algorithm)
+    raise ValueError(f"JWT_BACKEND inválido: {settings.JWT_BACKEND!r}")
+
+
+# --- Denylist (tokens revogados) ---
+
+
+class TokenDenylist:
+    """
+    `jti` de tokens revogados (logout, refresh já usado). Cada entrada só
+    precisa durar até o `exp` do token: depois disso ele já seria recusado.
+    """
+
+    async def add(self, jti: str, expires_at: float):
+        raise NotImplementedError
+
+    async def contains(self, jti: str) -> bool:
+        raise NotImplementedError
+
+    async def add_if_absent(self, jti: str, expires_at: float) -> bool:
+        """
+        Adiciona o jti se ele ainda não está na denylist, em uma operação
+        atômica: de requisições simultâneas com o mesmo token, só uma recebe
+        True (rotação do refresh token).
+        """
+        raise NotImplementedError
+
+    async def close(self):
+        """Libera conexões do backend (chamado no shutdown da aplicação)."""
+
+
+class MemoryDenylist(TokenDenylist):
+    """
+    Denylist do processo: um dict jti -> exp, consulta O(1). Sem limite de
+    tamanho (descartar uma entrada "desrevogaria" o token); as expiradas são
+    removidas aos poucos, a cada `purge_every` inserções.
+    """
+
+    def __init__(self, purge_every: int = 1024):
+        self._entries: Dict[str, float] = {}
+        self._purge_every = purge_every
+        self._added = 0
+
+    async def add(self, jti: str, expires_at: float):
+        self._insert(jti, expires_at)
+
+    def _insert(self, jti: str, expires_at: float):
+        self._entries[jti] = expires_at
+        self._added += 1
+        if self._added % self._purge_every == 0:
+            now = time.time()
+            self._entries = {
+                key: exp for key, exp in self._entries.items() if exp > now
+            }
+
+    async def contains(self, jti: str) -> bool:
+        expires_at = self._entries.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    async def add_if_absent(self, jti: str, expires_at: float) -> bool:
+        # Consulta e inserção sem ponto de suspensão: atômicas no event loop
+        current = self._entries.get(jti)
+        if current is not None and current > time.time():
+            return False
+        self._insert(jti, expires_at)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisDenylist(TokenDenylist):
+    """
+    Denylist compartilhada entre workers. Cada jti é uma chave com TTL até o
+    `exp` do token, então o Redis descarta sozinho as entradas vencidas.
+    """
+
+    def __init__(self, url: str, client=None, prefix: str = "denylist:"):
+        if client is None:
+            import redis.asyncio as redis
+
+            client = redis.Redis.from_url(url)
+        self._client = client
+        self._prefix = prefix
+
+    async def add(self, jti: str, expires_at: float):
+        ttl = int(expires_at - time.time()) + 1
+        if ttl > 0:
+            await self._client.set(self._prefix + jti, b"1", ex=ttl)
+
+    async def contains(self, jti: str) -> bool:
+        return bool(await self._client.exists(self._prefix + jti))
+
+    async def add_if_absent(self, jti: str, expires_at: float) -> bool:
+        # SET NX: a consulta e a inserção são um único comando no Redis
+        ttl = int(expires_at - time.time()) + 1
+        if ttl <= 0:
+            return False
+        return bool(await self._client.set(self._prefix + jti, b"1", ex=ttl, nx=True))
+
+    async def close(self):
+        await self._client.aclose()
+
+
+def create_denylist() -> TokenDenylist:
+    # Segue o backend do cache: com Redis, a revogação vale para todos os
+    # workers; em memória, só para o processo que recebeu o logout
+    if settings.CACHE_BACKEND == "redis":
+        return RedisDenylist(settings.CACHE_URL)
+    return MemoryDenylist()
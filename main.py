@@ -1,20 +1,56 @@
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.exc import SQLAlchemyError
 
-from core.database import create_db_and_tables
+from core import metrics
+from core.cache import response_cache
+from core.compression import CompressionMiddleware
+from core.config import settings
+from core.database import check_database, dispose_engines, migrate
+from core.profiling import profile_request
+from core.ratelimit import (
+    AdmissionController,
+    RateLimit,
+    rate_limit_backend,
+)
+from core.security import hashing_pool, token_denylist
 from routers import auth, posts, users
+from utilities.dependencies import auth_cache_stats
+
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup e shutdown de cada worker. A migração é idempotente e protegida
+    por lock; com `python -m core.server` ela já rodou uma vez antes dos
+    workers subirem e MIGRATE_ON_STARTUP vem desligado.
+    """
+    # 1. Startup
+    if settings.MIGRATE_ON_STARTUP:
+        print("Iniciando e criando o DB e as tabelas...")
+        migrate()
+    app.state.ready = True
 
-def on_start_up():
-    print("Iniciando e criando o DB e as tabelas...")
-    create_db_and_tables()
+    yield
+
+    # 2. Shutdown: /readyz passa a responder 503 e os recursos são liberados
+    app.state.ready = False
+    hashing_pool.shutdown()
+    await response_cache.close()
+    await token_denylist.close()
+    await rate_limit_backend.close()
+    await dispose_engines()
 
 
 app = FastAPI(
     title="Api de Blog do Professor.",
     description="Uma API RESTFul completa para gerenciar posts de blog e usuários",
     version="1.0.0",
-    on_startup=[on_start_up],
+    lifespan=lifespan,
     openapi_tags=[
         {"name": "posts", "description": "Operações CRUD em posts de blog."},
         {"name": "users", "description": "Operações de usuário e autenticação."},
@@ -35,9 +71,128 @@ app.add_middleware(
 
 )
 
-app.include_router(auth.router)
-app.include_router(users.router)
-app.include_router(posts.router)
+# Dentro do middleware de métricas: a latência medida inclui a compressão
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    compresslevel=settings.GZIP_COMPRESS_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY if settings.BROTLI_ENABLED else None,
+)
+
+
+
+@app.middleware("http")
+async def collect_metrics(request: Request, call_next):
+    """
+    Mede latência, requisições em andamento e statements/tempo de banco
+    de cada requisição, agrupando pela rota (template) e não pela URL.
+    """
+    db_stats = metrics.start_request_tracking()
+    metrics.http_requests_in_flight.inc(amount=1)
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        if settings.PROFILING_ENABLED and request.headers.get("x-profile") == "1":
+            response = await profile_request(request, call_next)
+        else:
+            response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.http_requests_in_flight.inc(amount=-1)
+
+        route = request.scope.get("route")
+        path = route.path if route is not None else "<sem rota>"
+        metrics.http_requests_total.inc(request.method, path, str(status_code))
+        metrics.http_request_duration.observe(elapsed, request.method, path)
+        metrics.db_queries_per_request.observe(db_stats[0], request.method, path)
+        metrics.db_time_per_request.observe(db_stats[1], request.method, path)
+
+
+def _collect_cache_stats():
+    caches = {f"auth_{name}": stats for name, stats in auth_cache_stats().items()}
+    caches.update(
+        {f"response_{route}": stats for route, stats in response_cache.stats().items()}
+    )
+    for cache, stats in caches.items():
+        metrics.cache_events.set(cache, "hit", value=stats["hits"])
+        metrics.cache_events.set(cache, "miss", value=stats["misses"])
+
+
+metrics.registry.add_collector(_collect_cache_stats)
+
+
+@app.get("/metrics", include_in_schema=False)
+def read_metrics():
+    """
+    Métricas no formato texto do Prometheus.
+    """
+    return PlainTextResponse(
+        metrics.registry.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@app.get("/healthz", include_in_schema=False)
+def healthz():
+    """
+    Liveness: o processo está de pé e atendendo. Não consulta o banco.
+    """
+    return {"status": "ok"}
+
+
+@app.get("/readyz", include_in_schema=False)
+async def readyz(request: Request):
+    """
+    Readiness: o startup terminou e o banco responde. Retorna 503 durante o
+    startup/shutdown ou se o banco estiver inacessível.
+    """
+    if not getattr(request.app.state, "ready", False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Aplicação ainda não está pronta.",
+        )
+    try:
+        await check_database()
+    except (SQLAlchemyError, OSError):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Banco de dados indisponível.",
+        )
+    return {"status": "ready"}
+
+
+# Proteção contra sobrecarga, configurada por router. O rate limit (429)
+# vem antes da admissão (503), para que um cliente acima do limite não ocupe
+# vaga. O login tem limites próprios: cada tentativa custa um Argon2 (o
+# limite por conta fica na rota, ver routers/auth.py).
+auth_protection = [
+    Depends(RateLimit("auth_ip", settings.RATE_LIMIT_AUTH_IP)),
+    Depends(
+        AdmissionController(
+            "auth",
+            settings.ADMISSION_AUTH_CONCURRENCY,
+            settings.ADMISSION_AUTH_QUEUE,
+            settings.ADMISSION_QUEUE_TIMEOUT,
+        )
+    ),
+]
+# /users e /posts dividem o mesmo limite por IP e a mesma fila de admissão
+api_protection = [
+    Depends(RateLimit("api_ip", settings.RATE_LIMIT_API_IP)),
+    Depends(
+        AdmissionController(
+            "api",
+            settings.ADMISSION_API_CONCURRENCY,
+            settings.ADMISSION_API_QUEUE,
+            settings.ADMISSION_QUEUE_TIMEOUT,
+        )
+    ),
+]
+
+app.include_router(auth.router, dependencies=auth_protection)
+app.include_router(users.router, dependencies=api_protection)
+app.include_router(posts.router, dependencies=api_protection)
 
 
 @app.get("/")
@@ -1,26 +1,46 @@
+from datetime import datetime, timezone
 from typing import List, Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
 
 class User(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     username: str = Field(unique=True, index=True)
-    email: str = Field(unique=True)
+    email: str = Field(unique=True, index=True)
     password: str
 
+    # Quantidade de posts do usuário, mantida pelas rotas de escrita
+    # (core.counters) para não precisar de COUNT(*) a cada leitura
+    post_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+
     # 1. Relacionamento: Um usuário pode ter muitos posts (lazy loading)
     posts: List["Post"] = Relationship(back_populates="author")
 
 
 class Post(SQLModel, table=True):
+    # Índices compostos usados pela paginação por cursor (keyset) em GET /posts:
+    # o filtro vem primeiro e o 'id' em seguida, para que o "WHERE ... AND id < ?"
+    # seja resolvido direto no índice, sem varrer a tabela.
+    __table_args__ = (
+        Index("ix_post_published_id", "published", "id"),
+        Index("ix_post_author_id_id", "author_id", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str
     content: str
     published: bool = True
 
+    # Versão do post (ETag/Last-Modified); atualizado em cada edição
+    updated_at: Optional[datetime] = Field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+
     # 2. Foreign Key: Conecta o post ao autor (User)
     author_id: int = Field(foreign_key="user.id")
 
-    # 3. Relacionamento: Um post pertence a um autor (eager loading)
+    # 3. Relacionamento: Um post pertence a um autor
+    # (as rotas carregam o autor com joinedload para evitar N+1)
     author: User = Relationship(back_populates="posts")
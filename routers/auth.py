@@ -1,13 +1,25 @@
 from datetime import timedelta
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from core.config import settings
-from core.database import get_session
-from core.security import create_access_token, verify_password
+from core.database import get_async_session
+from core.ratelimit import login_failures
+from core.security import (
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    get_current_token,
+    revoke_token,
+    revoke_token_once,
+    verify_and_rehash_async,
+)
 from models import User
+from schemas import LogoutRequest, RefreshRequest, TokenPair
 
 router = APIRouter(
     prefix="/auth",  # Prefixos reduzem repetição nas rotas
@@ -18,23 +30,108 @@ router = APIRouter(
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
 
-@router.post("/token")
-def login_access_token(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_session)
+@router.post("/token", response_model=TokenPair)
+async def login_access_token(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_session),
 ):
-    user = db.exec(select(User).where(User.email == form_data.username)).first()
-    if not user or not verify_password(form_data.password, user.password):
+    # Conta com muitas senhas erradas recentes: 429 antes de gastar um Argon2
+    await login_failures.check(form_data.username)
+
+    user = (
+        await db.exec(select(User).where(User.email == form_data.username))
+    ).first()
+
+    # Argon2 é caro (CPU): a verificação roda no pool dedicado
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await verify_and_rehash_async(
+            form_data.password, user.password
+        )
+    if not valid:
+        await login_failures.record_failure(form_data.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciais inválidas.",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Hash gerado com parâmetros antigos do Argon2: aproveitamos a senha em
+    # texto puro (só disponível no login) para atualizá-lo.
+    if new_hash:
+        user.password = new_hash
+        db.add(user)
+        await db.commit()
+
     # Geração do Token usando a variável de settings
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
     access_token = create_access_token(
         data={"sub": user.email}, expires_delta=access_token_expires
     )
+    refresh_token = create_refresh_token(data={"sub": user.email})
+
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+    }
+
+
+@router.post("/refresh", response_model=TokenPair)
+async def refresh_access_token(
+    body: RefreshRequest, db: AsyncSession = Depends(get_async_session)
+):
+    """
+    Troca um refresh token válido por um novo par de tokens, sem verificar a
+    senha de novo. O refresh token usado é revogado (rotação): reutilizá-lo
+    devolve 401.
+    """
+    # 1. Validar o refresh token (assinatura, expiração e tipo) e revogá-lo
+    # na mesma operação da consulta à denylist: de duas requisições com o
+    # mesmo token, só uma passa (rotação)
+    claims = decode_token(body.refresh_token, "refresh")
+    if not await revoke_token_once(claims):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token revogado.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # 2. O usuário ainda precisa existir
+    email = claims["sub"]
+    user_id = (await db.exec(select(User.id).where(User.email == email))).first()
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Usuário não encontrado.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return {
+        "access_token": create_access_token(data={"sub": email}),
+        "refresh_token": create_refresh_token(data={"sub": email}),
+        "token_type": "bearer",
+    }
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    body: Optional[LogoutRequest] = None,
+    claims: dict = Depends(get_current_token),
+):
+    """
+    Revoga o access token da requisição e, se enviado, o refresh token do
+    mesmo usuário. Os tokens revogados valem até expirar, então a denylist
+    não cresce indefinidamente.
+    """
+    await revoke_token(claims)
 
-    return {"access_token": access_token, "token_type": "bearer"}
+    if body is not None and body.refresh_token:
+        refresh_claims = decode_token(body.refresh_token, "refresh")
+        if refresh_claims["sub"] != claims["sub"]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="O refresh token pertence a outro usuário.",
+            )
+        await revoke_token(refresh_claims)
@@ -1,15 +1,84 @@
-from typing import List, Optional
+import hashlib
+import json
+from collections import Counter
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import ValidationError
+from sqlalchemy import and_, delete, insert, or_, update
+from sqlalchemy.orm import joinedload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from core.database import get_session
+from core.cache import CachedResponse, response_cache
+from core.config import settings
+from core.counters import adjust_post_counts
+from core.database import (
+    get_async_session,
+    get_read_session,
+    reads_from_replica,
+    reads_own_writes,
+)
+from core.search import (
+    build_match_query,
+    highlight_snippet,
+    is_supported,
+    search_subquery,
+)
 from models import Post, User
-from schemas import PostCreate, PostPublic
-from utilities.dependencies import check_max_limit, get_current_active_user
+from schemas import (
+    BulkItemResult,
+    PostBulkDelete,
+    PostBulkUpdate,
+    PostCreate,
+    PostFields,
+    PostFieldsPage,
+    PostPage,
+    PostPublic,
+    PostSearchPage,
+)
+from utilities.dependencies import (
+    check_max_limit,
+    get_current_active_user,
+    get_post_fields,
+    user_cache,
+)
+from utilities.http_cache import cached_json_response, make_etag
+from utilities.pagination import decode_cursor, encode_cursor
+from utilities.serialization import (
+    dumps,
+    post_payload,
+    post_row,
+    post_version,
+    select_post_rows,
+)
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
+# Namespace das gerações do cache de listagens de posts
+POSTS_CACHE_NAMESPACE = "posts"
+
+
+async def _get_post_with_author(db: AsyncSession, post_id: int) -> Optional[Post]:
+    """
+    Carrega o post já com o autor (JOIN), evitando o SELECT extra do lazy
+    loading quando o PostPublic serializa o campo 'author'.
+    """
+    statement = (
+        select(Post).where(Post.id == post_id).options(joinedload(Post.author))
+    )
+    return (await db.exec(statement)).first()
+
 
 @router.post(
     "/",
@@ -20,8 +89,10 @@ router = APIRouter(prefix="/posts", tags=["posts"])
         404: {"description": "Recurso não encontrado."},
     },
 )
-def create_post(post: PostCreate, db: Session = Depends(get_session)):
-    author_exists = db.get(User, post.author_id)
+async def create_post(
+    post: PostCreate, db: AsyncSession = Depends(get_async_session)
+):
+    author_exists = await db.get(User, post.author_id)
     if not author_exists:
         raise HTTPException(
             status_code=404, detail=f"Autor com ID {post.author_id} não encontrado."
@@ -29,42 +100,606 @@ def create_post(post: PostCreate, db: Session = Depends(get_session)):
 
     db_post = Post.model_validate(post)
     db.add(db_post)
-    db.commit()
-    db.refresh(db_post)
-    return db_post
+    await adjust_post_counts(db, {post.author_id: 1})
+    await db.commit()
+
+    # Páginas em cache e o usuário em cache (post_count) ficaram desatualizados
+    await response_cache.bump_generation(POSTS_CACHE_NAMESPACE)
+    user_cache.delete(author_exists.email)
+    return await _get_post_with_author(db, db_post.id)
+
+
+async def _search_posts(
+    db: AsyncSession,
+    match: str,
+    limit: int,
+    published: Optional[bool],
+    author_id: Optional[int],
+    cursor: Optional[str],
+    fields: Optional[Tuple[str, ...]] = None,
+) -> Tuple[list, Optional[str]]:
+    """
+    Busca ranqueada (bm25) no índice FTS5, paginada por cursor (rank, id).
+    Retorna as linhas da página (colunas dos campos pedidos + rank e snippet)
+    e o cursor da próxima.
+    """
+    fts = search_subquery(match)
+
+    # 1. Posts que casam com a busca, do mais relevante para o menos relevante
+    statement = (
+        select_post_rows(fts.c.rank, fts.c.snippet, fields=fields)
+        .join(fts, fts.c.id == Post.id)
+        .order_by(fts.c.rank, Post.id)
+    )
+
+    # 2. Mesmos filtros da listagem normal
+    if published is not None:
+        statement = statement.where(Post.published == published)
+    if author_id is not None:
+        statement = statement.where(Post.author_id == author_id)
+
+    # 3. Continuar a partir do (rank, id) do último item entregue
+    after = decode_cursor(cursor)
+    if after is not None:
+        last_rank, last_id = after.get("rank"), after.get("id")
+        if not isinstance(last_rank, (int, float)) or not isinstance(last_id, int):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido."
+            )
+        statement = statement.where(
+            or_(
+                fts.c.rank > last_rank,
+                and_(fts.c.rank == last_rank, Post.id > last_id),
+            )
+        )
+
+    results = (await db.exec(statement.limit(limit + 1))).all()
+    rows = results[:limit]
+
+    next_cursor = None
+    if len(results) > limit:
+        next_cursor = encode_cursor({"rank": rows[-1].rank, "id": rows[-1].id})
+
+    return rows, next_cursor
+
 
+def _post_cache_key(post_id: int) -> str:
+    return f"posts:item:{post_id}"
 
-@router.get("/", response_model=List[PostPublic])  # Agora retornando do DB de verdade
-def list_posts(
+
+async def _get_or_load(
+    db: AsyncSession,
+    route: str,
+    key: str,
+    loader: Callable[[], Awaitable[Optional[CachedResponse]]],
+    namespace: Optional[str] = None,
+) -> Optional[CachedResponse]:
+    """
+    `response_cache.get_or_load` para a sessão de leitura `db`. Logo depois
+    de uma escrita do cliente (read-your-writes) o cache é ignorado: ele pode
+    ter sido preenchido por uma réplica ainda sem a escrita.
+    """
+    if reads_own_writes(db):
+        return await loader()
+    return await response_cache.get_or_load(
+        route, key, loader, replica=reads_from_replica(db), namespace=namespace
+    )
+
+
+def _post_cache_entry(
+    row, fields: Optional[Tuple[str, ...]] = None
+) -> CachedResponse:
+    return CachedResponse(
+        body=dumps(post_payload(row, fields)),
+        etag=make_etag(fields, post_version(row, fields)),
+        last_modified=row.updated_at,
+    )
+
+
+@router.get("/", response_model=Union[PostSearchPage, PostPage, PostFieldsPage])
+async def list_posts(
+    request: Request,
     limit: int = Depends(check_max_limit),
-    published: bool = True,
+    published: Optional[bool] = True,
+    author_id: Optional[int] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_session),
+    cursor: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = Depends(get_post_fields),
+    db: AsyncSession = Depends(get_read_session),
 ):
-    # Criando a query base
-    statement = select(Post)
+    """
+    Lista posts do mais recente para o mais antigo, paginando por cursor (keyset).
+    O cursor carrega apenas o 'id' do último item entregue, então o custo de
+    cada página não depende da profundidade (ao contrário de OFFSET).
 
-    # Exemplo de como aplicar filtros reais se quiser:
-    # if published: statement = statement.where(Post.published == True)
+    Com `search`, os resultados vêm da busca full-text, ordenados por
+    relevância e com um trecho destacado ('snippet') de cada post.
+
+    Com `fields` (ex.: "title,excerpt,author"), cada item traz só esses
+    campos e o id; "excerpt" é o começo do conteúdo, no lugar do texto todo.
+    """
+    searching = search is not None and is_supported(db.bind)
+    if searching and build_match_query(search) is None:
+        return PostSearchPage(items=[])
+
+    entry = await post_page_entry(
+        db, limit, published, author_id, search, cursor, "list_posts", fields=fields
+    )
+    return cached_json_response(request, entry)
+
+
+async def post_page_entry(
+    db: AsyncSession,
+    limit: int,
+    published: Optional[bool],
+    author_id: Optional[int],
+    search: Optional[str],
+    cursor: Optional[str],
+    route: str,
+    check_author: bool = False,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> Optional[CachedResponse]:
+    """
+    Página de posts (já serializada) a partir do cache de respostas ou do
+    banco. Também usada pelo feed do autor, GET /users/{id}/posts: com
+    `check_author`, uma página vazia de um autor inexistente retorna None.
+    """
+    searching = search is not None and is_supported(db.bind)
+    match = build_match_query(search) if searching else None
+
+    async def load_page() -> Optional[CachedResponse]:
+        if searching:
+            rows, next_cursor = await _search_posts(
+                db, match, limit, published, author_id, cursor, fields
+            )
+        else:
+            rows, next_cursor = await _list_posts(
+                db, limit, published, author_id, search, cursor, fields
+            )
+        if check_author and not rows and await db.get(User, author_id) is None:
+            return None
+
+        # Caminho rápido: dicionários montados das tuplas, direto para o orjson
+        items = [post_payload(row, fields) for row in rows]
+        versions = [post_version(row, fields) for row in rows]
+        if searching:
+            for item, row in zip(items, rows):
+                item["snippet"] = highlight_snippet(row.snippet)
+            versions = [(version, row.snippet) for version, row in zip(versions, rows)]
+
+        return CachedResponse(
+            body=dumps({"items": items, "next_cursor": next_cursor}),
+            etag=make_etag(fields, next_cursor, *versions),
+            # Sem Last-Modified: o maior updated_at da página não muda quando
+            # um post sai dela (removido ou despublicado); só o ETag vale
+            last_modified=None,
+        )
+
+    # A geração muda a cada escrita em posts, invalidando todas as páginas
+    generation = await response_cache.generation(POSTS_CACHE_NAMESPACE)
+    params = (
+        generation,
+        limit,
+        published,
+        author_id,
+        search,
+        cursor,
+        check_author,
+        fields,
+    )
+    key = f"posts:list:{hashlib.sha1(repr(params).encode('utf-8')).hexdigest()}"
+
+    return await _get_or_load(
+        db, route, key, load_page, namespace=POSTS_CACHE_NAMESPACE
+    )
+
+
+async def _list_posts(
+    db: AsyncSession,
+    limit: int,
+    published: Optional[bool],
+    author_id: Optional[int],
+    search: Optional[str],
+    cursor: Optional[str],
+    fields: Optional[Tuple[str, ...]] = None,
+) -> Tuple[list, Optional[str]]:
+    """
+    Listagem por id decrescente, paginada por cursor (id).
+    """
+    # 1. Query base ordenada pela chave do cursor
+    statement = select_post_rows(fields=fields).order_by(Post.id.desc())
+
+    # 2. Filtros aplicados no SQL (cobertos pelos índices de models.Post)
+    if published is not None:
+        statement = statement.where(Post.published == published)
+    if author_id is not None:
+        statement = statement.where(Post.author_id == author_id)
+    if search is not None:
+        # Bancos sem FTS5: filtro simples, sem ranking
+        pattern = f"%{search}%"
+        statement = statement.where(
+            or_(Post.title.ilike(pattern), Post.content.ilike(pattern))
+        )
+
+    # 3. Continuar a partir do último item da página anterior
+    after = decode_cursor(cursor)
+    if after is not None:
+        last_id = after.get("id")
+        if not isinstance(last_id, int):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido."
+            )
+        statement = statement.where(Post.id < last_id)
+
+    # 4. Buscamos um item a mais para saber se existe próxima página
+    results = (await db.exec(statement.limit(limit + 1))).all()
+    items = results[:limit]
+
+    next_cursor = None
+    if len(results) > limit:
+        next_cursor = encode_cursor({"id": items[-1].id})
+
+    return items, next_cursor
+
+
+# --- Operações em lote ---
+
+# Marca uma linha NDJSON que não é um JSON válido
+_INVALID_JSON = object()
+
+
+def _parse_ndjson_line(line: bytes):
+    try:
+        return json.loads(line)
+    except ValueError:
+        return _INVALID_JSON
+
+
+async def _iter_bulk_payload(request: Request) -> AsyncIterator[Any]:
+    """
+    Itens de POST /posts/bulk. Com Content-Type application/x-ndjson o corpo é
+    lido em streaming, linha a linha; senão é esperado um array JSON.
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("application/x-ndjson"):
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield _parse_ndjson_line(line)
+        if buffer.strip():
+            yield _parse_ndjson_line(buffer)
+        return
+
+    try:
+        body = await request.json()
+    except ValueError:
+        body = None
+    if not isinstance(body, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="O corpo deve ser um array JSON ou NDJSON.",
+        )
+    for item in body:
+        yield item
+
+
+async def _insert_chunk(
+    db: AsyncSession, chunk: List[Tuple[int, PostCreate]]
+) -> List[BulkItemResult]:
+    """
+    Valida os autores do lote com uma única query e insere os posts válidos
+    com um executemany, em uma transação.
+    """
+    results = []
+
+    # 1. Quais autores existem (uma query para o lote inteiro)
+    author_ids = {post.author_id for _, post in chunk}
+    found = dict(
+        (
+            await db.exec(
+                select(User.id, User.email).where(User.id.in_(author_ids))
+            )
+        ).all()
+    )
+
+    # 2. Separar itens válidos dos que apontam para autores inexistentes
+    rows, indexes = [], []
+    now = datetime.now(timezone.utc)
+    for index, post in chunk:
+        if post.author_id not in found:
+            results.append(
+                BulkItemResult(
+                    index=index,
+                    status=status.HTTP_404_NOT_FOUND,
+                    detail=f"Autor com ID {post.author_id} não encontrado.",
+                )
+            )
+            continue
+        rows.append({**post.model_dump(), "updated_at": now})
+        indexes.append(index)
+
+    # 3. Inserir tudo de uma vez, recebendo os ids na ordem dos parâmetros,
+    # e somar os posts de cada autor aos contadores na mesma transação
+    if rows:
+        statement = insert(Post).returning(Post.id, sort_by_parameter_order=True)
+        ids = (await db.exec(statement, params=rows)).scalars().all()
+        await adjust_post_counts(db, Counter(row["author_id"] for row in rows))
+        await db.commit()
+        for author_id in {row["author_id"] for row in rows}:
+            user_cache.delete(found[author_id])
+        results.extend(
+            BulkItemResult(index=index, status=status.HTTP_201_CREATED, id=post_id)
+            for index, post_id in zip(indexes, ids)
+        )
 
-    results = db.exec(statement.limit(limit)).all()
     return results
 
 
-@router.get("/{post_id}", response_model=PostPublic)
-def read_post(post_id: int, db: Session = Depends(get_session)):
-    post = db.get(Post, post_id)
-    if not post:
+@router.post(
+    "/bulk",
+    response_model=List[BulkItemResult],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/PostCreate"},
+                    }
+                },
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def create_posts_bulk(
+    request: Request, db: AsyncSession = Depends(get_async_session)
+):
+    """
+    Cria vários posts de uma vez (array JSON ou NDJSON). Os itens são
+    inseridos em lotes de BULK_CHUNK_SIZE, cada lote em uma transação, e a
+    resposta traz o resultado de cada item na ordem em que foi enviado.
+    Acima de BULK_MAX_ITEMS o corpo deixa de ser lido: um único item 413,
+    no índice do primeiro excedente, indica que o resto foi ignorado.
+    """
+    results: List[BulkItemResult] = []
+    chunk: List[Tuple[int, PostCreate]] = []
+    index = -1
+
+    async for raw in _iter_bulk_payload(request):
+        index += 1
+
+        if index >= settings.BULK_MAX_ITEMS:
+            results.append(
+                BulkItemResult(
+                    index=index,
+                    status=413,
+                    detail=(
+                        f"Limite de {settings.BULK_MAX_ITEMS} itens excedido; "
+                        "este item e os seguintes foram ignorados."
+                    ),
+                )
+            )
+            break
+
+        if raw is _INVALID_JSON:
+            results.append(
+                BulkItemResult(
+                    index=index,
+                    status=422,
+                    detail="JSON inválido.",
+                )
+            )
+            continue
+
+        try:
+            chunk.append((index, PostCreate.model_validate(raw)))
+        except ValidationError as exc:
+            results.append(
+                BulkItemResult(
+                    index=index,
+                    status=422,
+                    detail="; ".join(
+                        f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                        for error in exc.errors()
+                    ),
+                )
+            )
+            continue
+
+        if len(chunk) >= settings.BULK_CHUNK_SIZE:
+            results.extend(await _insert_chunk(db, chunk))
+            chunk = []
+
+    if chunk:
+        results.extend(await _insert_chunk(db, chunk))
+
+    if any(result.status == status.HTTP_201_CREATED for result in results):
+        await response_cache.bump_generation(POSTS_CACHE_NAMESPACE)
+
+    return sorted(results, key=lambda result: result.index)
+
+
+async def _check_ownership(
+    db: AsyncSession, items: List[Tuple[int, int]], current_user: User, action: str
+) -> Tuple[List[Tuple[int, int]], List[BulkItemResult]]:
+    """
+    Mesmas regras de update_post/delete_post, para um lote de (index, post_id)
+    com uma única query. Retorna os itens permitidos e os resultados de erro.
+    """
+    post_ids = {post_id for _, post_id in items}
+    owners = dict(
+        (
+            await db.exec(
+                select(Post.id, Post.author_id).where(Post.id.in_(post_ids))
+            )
+        ).all()
+    )
+
+    allowed, errors = [], []
+    for index, post_id in items:
+        if post_id not in owners:
+            errors.append(
+                BulkItemResult(
+                    index=index,
+                    status=status.HTTP_404_NOT_FOUND,
+                    id=post_id,
+                    detail="Post não encontrado.",
+                )
+            )
+        elif owners[post_id] != current_user.id:
+            errors.append(
+                BulkItemResult(
+                    index=index,
+                    status=status.HTTP_403_FORBIDDEN,
+                    id=post_id,
+                    detail=f"Você não tem permissão para {action} esse post.",
+                )
+            )
+        else:
+            allowed.append((index, post_id))
+    return allowed, errors
+
+
+def _check_bulk_size(size: int):
+    if size > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Limite de {settings.BULK_MAX_ITEMS} itens excedido.",
+        )
+
+
+@router.patch("/bulk", response_model=List[BulkItemResult])
+async def update_posts_bulk(
+    updates: List[PostBulkUpdate],
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Atualiza vários posts do usuário logado. Só os campos enviados são
+    alterados; posts de outros autores resultam em 403 no item.
+    """
+    _check_bulk_size(len(updates))
+    results: List[BulkItemResult] = []
+    size = settings.BULK_CHUNK_SIZE
+
+    for start in range(0, len(updates), size):
+        chunk = list(enumerate(updates[start : start + size], start=start))
+        allowed, errors = await _check_ownership(
+            db, [(index, item.id) for index, item in chunk], current_user, "editar"
+        )
+        results.extend(errors)
+        if not allowed:
+            continue
+
+        # UPDATE em lote pela chave primária (executemany)
+        now = datetime.now(timezone.utc)
+        rows = [
+            {**updates[index].model_dump(exclude_unset=True), "updated_at": now}
+            for index, _ in allowed
+        ]
+        await db.exec(update(Post), params=rows)
+        await db.commit()
+
+        # Geração antes das chaves dos itens (ver ResponseCache)
+        await response_cache.bump_generation(POSTS_CACHE_NAMESPACE)
+        for index, post_id in allowed:
+            await response_cache.delete(_post_cache_key(post_id))
+            results.append(
+                BulkItemResult(index=index, status=status.HTTP_200_OK, id=post_id)
+            )
+
+    return sorted(results, key=lambda result: result.index)
+
+
+@router.delete("/bulk", response_model=List[BulkItemResult])
+async def delete_posts_bulk(
+    payload: PostBulkDelete,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Remove vários posts do usuário logado; posts de outros autores
+    resultam em 403 no item.
+    """
+    _check_bulk_size(len(payload.ids))
+    results: List[BulkItemResult] = []
+    size = settings.BULK_CHUNK_SIZE
+
+    for start in range(0, len(payload.ids), size):
+        chunk = list(enumerate(payload.ids[start : start + size], start=start))
+        allowed, errors = await _check_ownership(db, chunk, current_user, "deletar")
+        results.extend(errors)
+        if not allowed:
+            continue
+
+        allowed_ids = {post_id for _, post_id in allowed}
+        deleted = await db.exec(
+            delete(Post)
+            .where(Post.id.in_(allowed_ids))
+            .execution_options(synchronize_session=False)
+        )
+        # rowcount: posts removidos de fato (algum pode ter sumido no meio)
+        await adjust_post_counts(db, {current_user.id: -deleted.rowcount})
+        await db.commit()
+        user_cache.delete(current_user.email)
+
+        await response_cache.bump_generation(POSTS_CACHE_NAMESPACE)
+        for index, post_id in allowed:
+            await response_cache.delete(_post_cache_key(post_id))
+            results.append(
+                BulkItemResult(
+                    index=index, status=status.HTTP_204_NO_CONTENT, id=post_id
+                )
+            )
+
+    return sorted(results, key=lambda result: result.index)
+
+
+@router.get("/{post_id}", response_model=Union[PostPublic, PostFields])
+async def read_post(
+    post_id: int,
+    request: Request,
+    fields: Optional[Tuple[str, ...]] = Depends(get_post_fields),
+    db: AsyncSession = Depends(get_read_session),
+):
+    """
+    Lê um post. Com `fields`, só os campos pedidos (como em list_posts).
+    """
+
+    async def load_post() -> Optional[CachedResponse]:
+        statement = select_post_rows(fields=fields).where(Post.id == post_id)
+        row = (await db.exec(statement)).first()
+        return _post_cache_entry(row, fields) if row else None
+
+    # O cache guarda só a representação completa, que as escritas atualizam
+    # ou removem; as parciais são uma leitura pela chave primária
+    if fields is None:
+        entry = await _get_or_load(
+            db,
+            "read_post",
+            _post_cache_key(post_id),
+            load_post,
+            namespace=POSTS_CACHE_NAMESPACE,
+        )
+    else:
+        entry = await load_post()
+    if entry is None:
         raise HTTPException(
             status_code=404, detail=f"Post com ID {post_id} não encontrado."
         )
-    return post
+    return cached_json_response(request, entry)
+
 
 @router.put("/{post_id}", response_model=PostPublic)
-def update_post(
+async def update_post(
     post_id: int,
     post_data: PostCreate,
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
     """
@@ -73,7 +708,7 @@ def update_post(
     """
 
     # 1. Buscar o post no banco de dados
-    db_post = db.get(Post, post_id)
+    db_post = await db.get(Post, post_id)
     if not db_post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -92,26 +727,45 @@ def update_post(
     update_data = post_data.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_post, key, value)
+    db_post.updated_at = datetime.now(timezone.utc)
+
+    # O post pode mudar de autor: o contador passa de um para o outro
+    new_author_id = db_post.author_id
+    if new_author_id != current_user.id:
+        await adjust_post_counts(db, {current_user.id: -1, new_author_id: 1})
     
-    # 4. Persistir no banco
+    # 4. Persistir no banco e recarregar já com o autor
     db.add(db_post)
-    db.commit()
-    db.refresh(db_post)
+    await db.commit()
+    if new_author_id != current_user.id:
+        user_cache.delete(current_user.email)
+        new_author = await db.get(User, new_author_id)
+        if new_author is not None:
+            user_cache.delete(new_author.email)
+    db_post = await _get_post_with_author(db, db_post.id)
+
+    # 5. Invalidar as páginas e atualizar o cache (write-through); a geração
+    # vem antes, para que uma leitura em andamento não grave a versão antiga
+    await response_cache.bump_generation(POSTS_CACHE_NAMESPACE)
+    await response_cache.set(
+        _post_cache_key(post_id), _post_cache_entry(post_row(db_post))
+    )
+    await response_cache.hold(_post_cache_key(post_id))
 
     return db_post
 
 
 
 @router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_post(
+async def delete_post(
     post_id: int,
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user),
 ):
     """
     Deleta um post se ele pertencer ao usuário logado.
     """
-    post_db = db.get(Post, post_id)
+    post_db = await db.get(Post, post_id)
 
     if not post_db:
         raise HTTPException(
@@ -124,6 +778,11 @@ def delete_post(
             detail="Não autorizado a deletar este post.",
         )
 
-    db.delete(post_db)
-    db.commit()
+    await db.delete(post_db)
+    await adjust_post_counts(db, {post_db.author_id: -1})
+    await db.commit()
+    user_cache.delete(current_user.email)
+
+    await response_cache.bump_generation(POSTS_CACHE_NAMESPACE)
+    await response_cache.delete(_post_cache_key(post_id))
     return None
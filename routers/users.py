@@ -1,28 +1,42 @@
-from typing import List
+from typing import Optional, Tuple, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from core.database import get_session
-from core.security import get_password_hash
+from core.config import settings
+from core.database import get_async_session, get_read_session, read_connection
+from core.security import hash_password_async
 
 from models import User
-from schemas import UserCreate, UserPublic
+from routers.posts import post_page_entry
+from schemas import PostFieldsPage, PostPage, UserCreate, UserPage, UserPublic
+from utilities.dependencies import check_max_limit, get_post_fields
 from utilities.dependencies import get_current_active_user  # Para rotas protegidas
+from utilities.http_cache import (
+    cached_json_response,
+    conditional_json_response,
+    make_etag,
+)
+from utilities.pagination import decode_cursor, encode_cursor
+from utilities.serialization import USER_PUBLIC_COLUMNS, dumps, user_payload
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
 # Rota protegida: GET /users/me
 @router.get("/me", response_model=UserPublic)
-def read_users_me(current_user: User = Depends(get_current_active_user)):
+async def read_users_me(current_user: User = Depends(get_current_active_user)):
     """Retorna o perfil do usuário logado."""
     return current_user
 
 
 # Rota para criar usuário: POST /users/
 @router.post("/", response_model=UserPublic, status_code=status.HTTP_201_CREATED)
-def create_user(user: UserCreate, db: Session = Depends(get_session)):
+async def create_user(
+    user: UserCreate, db: AsyncSession = Depends(get_async_session)
+):
     # ... (Lógica de validação de 72 bytes e verificação de usuário existente)
     if len(user.password.encode("utf-8")) > 72:
         raise HTTPException(
@@ -30,26 +44,117 @@ def create_user(user: UserCreate, db: Session = Depends(get_session)):
             detail="A senha excede o limite máximo de 72 bytes. Por favor, use uma senha mais curta.",
         )
 
-    existig_user = db.exec(select(User).where(User.email == user.email)).first()
+    existig_user = (
+        await db.exec(select(User).where(User.email == user.email))
+    ).first()
     if existig_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="E-mail já registrado"
         )
 
-    hashed_password = get_password_hash(user.password)
+    # Argon2 é caro (CPU): roda no pool dedicado, fora do event loop
+    hashed_password = await hash_password_async(user.password)
 
     db_user = User(username=user.username, email=user.email, password=hashed_password)
 
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 
-# Rota para ler todos os usuários: GET /users/
-@router.get("/", response_model=List[UserPublic])
-def read_users(db: Session = Depends(get_session)):
-    """Retorna a lista de todos os usuários."""
-    statement = select(User)
-    results = db.exec(statement).all()
-    return results
+# Rota para ler os usuários (paginada): GET /users/
+@router.get("/", response_model=UserPage)
+async def read_users(
+    request: Request,
+    limit: int = Depends(check_max_limit),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_session),
+):
+    """Retorna uma página de usuários, em ordem de id, paginada por cursor."""
+    statement = select(*USER_PUBLIC_COLUMNS).order_by(User.id).limit(limit + 1)
+
+    after = decode_cursor(cursor)
+    if after is not None:
+        last_id = after.get("id")
+        if not isinstance(last_id, int):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido."
+            )
+        statement = statement.where(User.id > last_id)
+
+    results = (await db.exec(statement)).all()
+    items = results[:limit]
+
+    next_cursor = None
+    if len(results) > limit:
+        next_cursor = encode_cursor({"id": items[-1].id})
+
+    # ETag das próprias linhas: um 304 não chega a serializar a página; no
+    # 200, o corpo é montado das tuplas (orjson)
+    def build_body() -> bytes:
+        return dumps(
+            {"items": [user_payload(row) for row in items], "next_cursor": next_cursor}
+        )
+
+    etag = make_etag(next_cursor, *(tuple(row) for row in items))
+    return conditional_json_response(request, etag, build_body)
+
+
+# Feed do autor: GET /users/{user_id}/posts (paginado por cursor)
+@router.get("/{user_id}/posts", response_model=Union[PostPage, PostFieldsPage])
+async def read_user_posts(
+    user_id: int,
+    request: Request,
+    limit: int = Depends(check_max_limit),
+    published: Optional[bool] = True,
+    cursor: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = Depends(get_post_fields),
+    db: AsyncSession = Depends(get_read_session),
+):
+    """
+    Posts de um usuário, do mais recente para o mais antigo. Cada página é
+    lida pelo índice (author_id, id) a partir do cursor, sem carregar a lista
+    inteira de `User.posts`. Aceita `fields` como GET /posts/.
+    """
+    entry = await post_page_entry(
+        db,
+        limit,
+        published,
+        author_id=user_id,
+        search=None,
+        cursor=cursor,
+        route="user_posts",
+        check_author=True,
+        fields=fields,
+    )
+    if entry is None:
+        raise HTTPException(
+            status_code=404, detail=f"Usuário com ID {user_id} não encontrado."
+        )
+    return cached_json_response(request, entry)
+
+
+# Exportação completa: GET /users/export (NDJSON, uma linha por usuário)
+@router.get("/export")
+async def export_users():
+    """
+    Exporta todos os usuários como NDJSON. As linhas são lidas do banco em
+    lotes (yield_per) e enviadas conforme chegam, então a memória usada não
+    cresce com o tamanho da tabela.
+    """
+    return StreamingResponse(_stream_users(), media_type="application/x-ndjson")
+
+
+async def _stream_users():
+    # Conexão própria (réplica, se houver): o streaming continua depois que a
+    # rota já retornou
+    async with read_connection() as conn, AsyncSession(bind=conn) as session:
+        statement = (
+            select(*USER_PUBLIC_COLUMNS)
+            .order_by(User.id)
+            .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        result = await session.stream(statement)
+        async for rows in result.partitions():
+            yield b"".join(dumps(user_payload(row)) + b"\n" for row in rows)
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, field_validator
 
 # --- Modelos de Usuário ---
 
@@ -13,9 +15,9 @@ class UserCreate(BaseModel):
     )
 
 
-# 2. UserPublic: Schema para a resposta do usuário (Saída GET/POST)
+# 2. AuthorPublic: Dados públicos do usuário, usados como autor de um post
 # Incluímos o 'id' (gerado pelo DB), mas omitimos a 'password'
-class UserPublic(BaseModel):
+class AuthorPublic(BaseModel):
     id: int
     username: str
     email: str
@@ -24,6 +26,19 @@ class UserPublic(BaseModel):
         from_attributes = True  # Necessário para ler dados do ORM (DB)
 
 
+# UserPublic: Schema para a resposta do usuário (Saída GET/POST)
+# 'post_count' fica fora do AuthorPublic: assim um post novo não muda o JSON
+# (nem o cache) de todos os outros posts do mesmo autor.
+class UserPublic(AuthorPublic):
+    post_count: int = 0
+
+
+# UserPage: Página de usuários com cursor opaco para a próxima página
+class UserPage(BaseModel):
+    items: List[UserPublic]
+    next_cursor: Optional[str] = None
+
+
 # --- Modelos de Post ---
 
 
@@ -43,7 +58,100 @@ class PostPublic(BaseModel):
     title: str
     content: str
     published: bool
-    author: UserPublic  # O objeto Author aninhado (usando o schema de saída de usuário)
+    author: AuthorPublic  # O objeto Author aninhado (sem o post_count)
 
     class Config:
         from_attributes = True
+
+
+# 5. PostPage: Página de posts com cursor opaco para a próxima página
+# 'next_cursor' é None quando não há mais resultados.
+class PostPage(BaseModel):
+    items: List[PostPublic]
+    next_cursor: Optional[str] = None
+
+
+# 6. PostSearchHit: Post retornado pela busca full-text, com o trecho destacado
+class PostSearchHit(PostPublic):
+    snippet: Optional[str] = None
+
+
+# 7. PostSearchPage: Página de resultados da busca, ordenada por relevância
+class PostSearchPage(PostPage):
+    items: List[PostSearchHit]
+
+
+# 8. PostFields: Post parcial, resposta com `fields=` (ex.: "title,excerpt")
+# Só o 'id' e os campos pedidos vêm no JSON; 'excerpt' é o começo do
+# conteúdo e 'snippet' só aparece na busca.
+class PostFields(BaseModel):
+    id: int
+    title: Optional[str] = None
+    content: Optional[str] = None
+    excerpt: Optional[str] = None
+    published: Optional[bool] = None
+    author: Optional[AuthorPublic] = None
+    snippet: Optional[str] = None
+
+
+# 9. PostFieldsPage: Página de posts parciais (listagens com `fields=`)
+class PostFieldsPage(BaseModel):
+    items: List[PostFields]
+    next_cursor: Optional[str] = None
+
+
+# --- Operações em lote ---
+
+
+# 10. PostBulkUpdate: Alteração parcial de um post em PATCH /posts/bulk
+# O autor não pode ser trocado em lote. Campos omitidos não mudam; null é
+# recusado (as colunas são NOT NULL).
+class PostBulkUpdate(BaseModel):
+    id: int
+    title: Optional[str] = None
+    content: Optional[str] = None
+    published: Optional[bool] = None
+
+    @field_validator("title", "content", "published")
+    @classmethod
+    def reject_null(cls, value):
+        # Só roda para campos enviados: o default None não é validado
+        if value is None:
+            raise ValueError("não pode ser null; omita o campo para mantê-lo")
+        return value
+
+
+# 11. PostBulkDelete: Ids dos posts a remover em DELETE /posts/bulk
+class PostBulkDelete(BaseModel):
+    ids: List[int]
+
+
+# 12. BulkItemResult: Resultado de cada item de uma operação em lote
+# 'index' é a posição do item na requisição; 'status' segue os códigos HTTP
+# que a rota individual responderia (201, 200, 204, 403, 404, 422).
+class BulkItemResult(BaseModel):
+    index: int
+    status: int
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+# --- Autenticação ---
+
+
+# 13. TokenPair: Resposta de POST /auth/token e POST /auth/refresh
+class TokenPair(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+
+
+# 14. RefreshRequest: Refresh token trocado por um novo par em POST /auth/refresh
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+# 15. LogoutRequest: Em POST /auth/logout, o refresh token (opcional) também
+# é revogado junto com o access token da requisição
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
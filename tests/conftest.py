@@ -0,0 +1,68 @@
+"""
+Configuração dos testes. As configurações são lidas no import de
+core.config, então o ambiente é definido aqui, antes de importar a app:
+banco SQLite temporário, rate limit desligado e Argon2 barato.
+"""
+
+import itertools
+import os
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="blog-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'test.db')}"
+os.environ["CACHE_BACKEND"] = "memory"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["ARGON2_TIME_COST"] = "1"
+os.environ["ARGON2_MEMORY_COST"] = "8192"
+os.environ["ARGON2_PARALLELISM"] = "1"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from main import app  # noqa: E402
+
+PASSWORD = "senha-de-teste"
+_ids = itertools.count()
+
+
+@pytest.fixture
+def anyio_backend():
+    # Testes assíncronos (@pytest.mark.anyio) rodam só no asyncio
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def make_user(client):
+    """Cria um usuário novo e devolve (usuário, headers com o access token)."""
+
+    def make_user():
+        name = f"user{next(_ids)}"
+        response = client.post(
+            "/users/",
+            json={"username": name, "email": f"{name}@test.com", "password": PASSWORD},
+        )
+        assert response.status_code == 201, response.text
+        tokens = client.post(
+            "/auth/token", data={"username": f"{name}@test.com", "password": PASSWORD}
+        ).json()
+        return response.json(), {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    return make_user
+
+
+@pytest.fixture
+def make_post(client):
+    def make_post(author_id: int, **fields):
+        payload = {"title": "Título", "content": "Conteúdo", "published": True}
+        payload.update(fields, author_id=author_id)
+        response = client.post("/posts/", json=payload)
+        assert response.status_code == 201, response.text
+        return response.json()
+
+    return make_post
@@ -0,0 +1,33 @@
+from conftest import PASSWORD
+from core.security import _credentials_error
+
+
+def _login(client, make_user):
+    user, _ = make_user()
+    response = client.post(
+        "/auth/token", data={"username": user["email"], "password": PASSWORD}
+    )
+    return response.json()
+
+
+def test_refresh_token_is_single_use(client, make_user):
+    tokens = _login(client, make_user)
+    body = {"refresh_token": tokens["refresh_token"]}
+
+    first = client.post("/auth/refresh", json=body)
+    assert first.status_code == 200
+    assert first.json()["refresh_token"] != tokens["refresh_token"]
+
+    reused = client.post("/auth/refresh", json=body)
+    assert reused.status_code == 401
+    assert reused.json()["detail"] == "Refresh token revogado."
+
+
+def test_invalid_token_errors_are_separate_instances(client):
+    first, second = _credentials_error(), _credentials_error()
+    assert first is not second
+    assert first.headers == {"WWW-Authenticate": "Bearer"}
+
+    response = client.get("/users/me", headers={"Authorization": "Bearer x.y.z"})
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
@@ -0,0 +1,66 @@
+"""
+Leituras de GET /posts/{id} que perdem o cache e terminam depois de um PUT
+ou DELETE do mesmo post não podem deixar a versão anterior no cache.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from core.cache import CachedResponse, response_cache
+from main import app
+
+
+@pytest.fixture
+def gated_loads(monkeypatch):
+    """Faz as cargas de read_post esperarem `release` depois de ler o banco."""
+    loaded, release = asyncio.Event(), asyncio.Event()
+    original = response_cache.get_or_load
+
+    async def get_or_load(route, key, loader, **options):
+        async def gated_loader():
+            entry = await loader()
+            loaded.set()
+            await release.wait()
+            return entry
+
+        return await original(route, key, gated_loader, **options)
+
+    monkeypatch.setattr(response_cache, "get_or_load", get_or_load)
+    return loaded, release
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("method", ["put", "delete"])
+async def test_read_racing_a_write_does_not_cache_the_old_version(
+    client, make_user, make_post, gated_loads, method
+):
+    author, headers = make_user()
+    post = make_post(author["id"], title="v1")
+    key = f"posts:item:{post['id']}"
+    await response_cache.delete(key)
+    loaded, release = gated_loads
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as http:
+        read = asyncio.create_task(http.get(f"/posts/{post['id']}"))
+        await loaded.wait()
+
+        if method == "put":
+            payload = {"title": "v2", "content": "c", "author_id": author["id"]}
+            response = await http.put(
+                f"/posts/{post['id']}", json=payload, headers=headers
+            )
+        else:
+            response = await http.delete(f"/posts/{post['id']}", headers=headers)
+        assert response.status_code in (200, 204)
+
+        release.set()
+        assert (await read).json()["title"] == "v1"
+
+    raw = await response_cache.backend.get(key)
+    if method == "put":
+        assert b'"v2"' in CachedResponse.from_bytes(raw).body
+    else:
+        assert raw is None
@@ -0,0 +1,135 @@
+import types
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from core import compression
+from core.compression import CompressionMiddleware, accepts_encoding
+
+BODY = "texto repetido " * 500
+
+inner = FastAPI()
+
+
+@inner.get("/big")
+def big():
+    return PlainTextResponse(BODY)
+
+
+@inner.get("/small")
+def small():
+    return PlainTextResponse("oi")
+
+
+@inner.get("/stream")
+def stream():
+    return StreamingResponse(iter([BODY, BODY]), media_type="text/plain")
+
+
+@inner.get("/image")
+def image():
+    return PlainTextResponse(BODY, media_type="image/png")
+
+
+def _client(thread_minimum_size=None, **options) -> TestClient:
+    middleware = CompressionMiddleware(inner, minimum_size=100, **options)
+    if thread_minimum_size is not None:
+        middleware.thread_minimum_size = thread_minimum_size
+    return TestClient(middleware)
+
+
+def _fake_brotli():
+    """Módulo `brotli` de mentira (deflate cru), que o teste sabe descomprimir."""
+
+    class Compressor:
+        def __init__(self, mode, quality):
+            assert mode == module.MODE_TEXT
+            self._zlib = zlib.compressobj(quality, zlib.DEFLATED, -zlib.MAX_WBITS)
+
+        def process(self, data):
+            return self._zlib.compress(data)
+
+        def flush(self):
+            return self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+        def finish(self):
+            return self._zlib.flush()
+
+    module = types.ModuleType("brotli")
+    module.MODE_TEXT = 1
+    module.Compressor = Compressor
+    return module
+
+
+@pytest.fixture
+def fake_brotli(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", _fake_brotli())
+
+
+def _get_raw(client: TestClient, path: str, accept_encoding: str):
+    """Headers e corpo sem a descompressão do httpx (que conhece o br real)."""
+    headers = {"Accept-Encoding": accept_encoding}
+    with client.stream("GET", path, headers=headers) as response:
+        return response.headers, b"".join(response.iter_raw())
+
+
+def _inflate(data: bytes) -> str:
+    return zlib.decompress(data, -zlib.MAX_WBITS).decode()
+
+
+def test_accepts_encoding():
+    assert accepts_encoding("gzip, br", "br")
+    assert accepts_encoding("br;q=0.5", "br")
+    assert not accepts_encoding("br;q=0", "br")
+    assert not accepts_encoding("gzip", "br")
+
+
+def test_gzip_and_minimum_size():
+    client = _client(brotli_quality=None)
+    response = client.get("/big", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == BODY
+
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_without_brotli_package_falls_back_to_gzip(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    response = _client().get("/big", headers={"Accept-Encoding": "br, gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+
+
+@pytest.mark.parametrize("thread_minimum_size", [1, 10**9], ids=["thread", "inline"])
+def test_brotli_when_accepted(fake_brotli, thread_minimum_size):
+    headers, body = _get_raw(_client(thread_minimum_size), "/big", "gzip, br")
+    assert headers["content-encoding"] == "br"
+    assert headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(body)
+    assert _inflate(body) == BODY
+
+
+def test_brotli_streaming_and_exclusions(fake_brotli):
+    client = _client()
+    headers, body = _get_raw(client, "/stream", "br")
+    assert headers["content-encoding"] == "br"
+    assert _inflate(body) == BODY * 2
+
+    for accept in ("br;q=0, gzip", "identity"):
+        response = client.get("/big", headers={"Accept-Encoding": accept})
+        assert response.headers.get("content-encoding") != "br"
+        assert response.text == BODY
+
+    response = client.get("/image", headers={"Accept-Encoding": "br"})
+    assert "content-encoding" not in response.headers
+
+
+def test_real_brotli_round_trip(monkeypatch):
+    brotli = pytest.importorskip("brotli")
+    monkeypatch.setattr(compression, "brotli", brotli)
+    headers, body = _get_raw(_client(), "/big", "br")
+    assert headers["content-encoding"] == "br"
+    assert brotli.decompress(body).decode() == BODY
@@ -0,0 +1,67 @@
+from sqlalchemy import text
+from sqlmodel import Session, select
+
+from core.counters import reconcile_post_counts
+from core.database import engine
+from models import User
+
+
+def _post_count(client, headers):
+    return client.get("/users/me", headers=headers).json()["post_count"]
+
+
+def _stored_counts(*user_ids):
+    with Session(engine) as session:
+        statement = select(User.id, User.post_count).where(User.id.in_(user_ids))
+        return dict(session.exec(statement).all())
+
+
+def test_single_writes_adjust_the_counter(client, make_user, make_post):
+    author, headers = make_user()
+    other, other_headers = make_user()
+    post = make_post(author["id"])
+    make_post(author["id"])
+    assert _post_count(client, headers) == 2
+
+    # Post passa para outro autor: o contador muda de um para o outro
+    payload = {"title": "t", "content": "c", "author_id": other["id"]}
+    assert client.put(f"/posts/{post['id']}", json=payload, headers=headers).is_success
+    assert _post_count(client, headers) == 1
+    assert _post_count(client, other_headers) == 1
+
+    assert client.delete(f"/posts/{post['id']}", headers=other_headers).is_success
+    assert _post_count(client, other_headers) == 0
+
+
+def test_bulk_writes_adjust_the_counter(client, make_user):
+    author, headers = make_user()
+    posts = [
+        {"title": f"t{i}", "content": "c", "author_id": author["id"]}
+        for i in range(5)
+    ]
+    created = client.post("/posts/bulk", json=posts).json()
+    assert _post_count(client, headers) == 5
+
+    ids = [item["id"] for item in created[:3]]
+    response = client.request(
+        "DELETE", "/posts/bulk", json={"ids": ids}, headers=headers
+    )
+    assert [item["status"] for item in response.json()] == [204] * 3
+    assert _post_count(client, headers) == 2
+
+
+def test_reconcile_fixes_drifted_counters(client, make_user, make_post):
+    author, _ = make_user()
+    empty, _ = make_user()
+    make_post(author["id"])
+    make_post(author["id"])
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE user SET post_count = 7 WHERE id IN (:a, :b)"),
+            {"a": author["id"], "b": empty["id"]},
+        )
+
+    assert reconcile_post_counts(engine, batch_size=1) >= 2
+    counts = _stored_counts(author["id"], empty["id"])
+    assert counts == {author["id"]: 2, empty["id"]: 0}
+    assert reconcile_post_counts(engine) == 0
@@ -0,0 +1,66 @@
+import pytest
+
+from core.config import settings
+
+
+@pytest.fixture
+def post(make_user, make_post):
+    author, _ = make_user()
+    return make_post(author["id"], title="Campos", content="palavra " * 100)
+
+
+def test_read_post_returns_only_requested_fields(client, post):
+    response = client.get(f"/posts/{post['id']}", params={"fields": "title"})
+    assert response.json() == {"id": post["id"], "title": "Campos"}
+
+    response = client.get(
+        f"/posts/{post['id']}", params={"fields": "author,published"}
+    )
+    assert set(response.json()) == {"id", "published", "author"}
+    assert response.json()["author"]["id"] == post["author"]["id"]
+
+
+def test_excerpt_is_cut_at_a_word_boundary(client, post, make_post):
+    response = client.get(f"/posts/{post['id']}", params={"fields": "excerpt"})
+    excerpt = response.json()["excerpt"]
+    assert excerpt.endswith("palavra…")
+    assert len(excerpt) <= settings.POST_EXCERPT_LENGTH + 1
+
+    short = make_post(post["author"]["id"], content="curto")
+    response = client.get(f"/posts/{short['id']}", params={"fields": "excerpt"})
+    assert response.json()["excerpt"] == "curto"
+
+
+@pytest.mark.parametrize("path", ["/posts/", "/posts/1", "/users/1/posts"])
+def test_unknown_fields_are_rejected(client, path):
+    response = client.get(path, params={"fields": "title,password"})
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
+
+
+def test_partial_and_full_representations_do_not_share_etag_or_cache(
+    client, post
+):
+    url = f"/posts/{post['id']}"
+    full = client.get(url)
+    partial = client.get(url, params={"fields": "title"})
+    assert full.headers["etag"] != partial.headers["etag"]
+
+    # O ETag da representação completa não vale para a parcial
+    response = client.get(
+        url,
+        params={"fields": "title"},
+        headers={"If-None-Match": full.headers["etag"]},
+    )
+    assert response.status_code == 200
+
+    # A ordem dos campos não muda a seleção (mesma chave de cache e ETag)
+    first = client.get(url, params={"fields": "author,title"})
+    second = client.get(url, params={"fields": "title, author"})
+    assert first.headers["etag"] == second.headers["etag"]
+
+    params = {"author_id": post["author"]["id"]}
+    titles = client.get("/posts/", params={**params, "fields": "title"}).json()
+    assert set(titles["items"][0]) == {"id", "title"}
+    page = client.get("/posts/", params=params).json()
+    assert page["items"][0]["content"] == post["content"]
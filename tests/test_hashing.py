@@ -0,0 +1,95 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+from passlib.hash import argon2
+from sqlmodel import Session, select
+
+from conftest import PASSWORD
+from core.database import engine
+from core.security import HashingPool, pwd_context
+from models import User
+
+
+@pytest.fixture
+def pool():
+    pool = HashingPool(workers=1, max_pending=1)
+    yield pool
+    pool.shutdown()
+
+
+async def _wait_until(condition, timeout=5):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condição não atingida")
+
+
+@pytest.mark.anyio
+async def test_saturated_pool_answers_503(pool):
+    release = threading.Event()
+    busy = asyncio.create_task(pool.run(release.wait))
+    await _wait_until(lambda: pool.pending == 1)
+
+    with pytest.raises(HTTPException) as rejected:
+        await pool.run(len, "x")
+    assert rejected.value.status_code == 503
+    assert rejected.value.headers["Retry-After"] == "1"
+
+    release.set()
+    assert await busy is True
+    await _wait_until(lambda: pool.pending == 0)
+    assert await pool.run(len, "x") == 1
+
+
+@pytest.mark.anyio
+async def test_cancelled_caller_keeps_the_slot_until_the_job_ends(pool):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_hash():
+        started.set()
+        release.wait()
+
+    caller = asyncio.create_task(pool.run(slow_hash))
+    await _wait_until(started.is_set)
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+
+    # O Argon2 continua rodando: a vaga não pode ser liberada ainda
+    await asyncio.sleep(0.05)
+    assert pool.pending == 1
+    with pytest.raises(HTTPException):
+        await pool.run(len, "x")
+
+    release.set()
+    await _wait_until(lambda: pool.pending == 0)
+
+
+def test_login_rehashes_outdated_password(client, make_user):
+    user, _ = make_user()
+    # Hash com parâmetros diferentes dos configurados (needs_update)
+    old_hash = argon2.using(
+        time_cost=1, memory_cost=4096, parallelism=1
+    ).hash(PASSWORD)
+    assert pwd_context.needs_update(old_hash)
+    with Session(engine) as session:
+        db_user = session.get(User, user["id"])
+        db_user.password = old_hash
+        session.add(db_user)
+        session.commit()
+
+    response = client.post(
+        "/auth/token", data={"username": user["email"], "password": PASSWORD}
+    )
+    assert response.status_code == 200
+
+    with Session(engine) as session:
+        new_hash = session.exec(
+            select(User.password).where(User.id == user["id"])
+        ).one()
+    assert new_hash != old_hash
+    assert not pwd_context.needs_update(new_hash)
+    assert pwd_context.verify(PASSWORD, new_hash)
@@ -0,0 +1,63 @@
+import pytest
+
+
+@pytest.mark.parametrize(
+    "date", ["Sun, 18 Oct 2099 09:46:59 -0000", "Sun, 18 Oct 2099 09:46:59 GMT"]
+)
+def test_if_modified_since_accepts_dates_without_timezone(
+    client, make_user, make_post, date
+):
+    author, _ = make_user()
+    post = make_post(author["id"])
+
+    response = client.get(f"/posts/{post['id']}", headers={"If-Modified-Since": date})
+    assert response.status_code == 304
+
+
+def test_read_post_revalidates_with_etag(client, make_user, make_post):
+    author, _ = make_user()
+    post = make_post(author["id"])
+
+    first = client.get(f"/posts/{post['id']}")
+    second = client.get(
+        f"/posts/{post['id']}", headers={"If-None-Match": first.headers["etag"]}
+    )
+    assert second.status_code == 304
+
+
+def test_post_list_is_not_revalidated_by_date_after_a_delete(
+    client, make_user, make_post
+):
+    author, headers = make_user()
+    kept = make_post(author["id"])
+    deleted = make_post(author["id"])
+    params = {"author_id": author["id"]}
+
+    first = client.get("/posts/", params=params)
+    assert "last-modified" not in first.headers
+    client.delete(f"/posts/{deleted['id']}", headers=headers)
+
+    second = client.get(
+        "/posts/",
+        params=params,
+        headers={"If-Modified-Since": "Sun, 18 Oct 2099 09:46:59 GMT"},
+    )
+    assert second.status_code == 200
+    assert [item["id"] for item in second.json()["items"]] == [kept["id"]]
+
+    third = client.get(
+        "/posts/", params=params, headers={"If-None-Match": first.headers["etag"]}
+    )
+    assert third.status_code == 200
+
+
+def test_list_users_304_does_not_serialize_the_page(client, make_user, monkeypatch):
+    make_user()
+    etag = client.get("/users/").headers["etag"]
+
+    def fail(content):
+        raise AssertionError("a página não deveria ser serializada")
+
+    monkeypatch.setattr("routers.users.dumps", fail)
+    response = client.get("/users/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
@@ -0,0 +1,30 @@
+from fastapi.testclient import TestClient
+
+from conftest import PASSWORD
+from main import app
+
+
+def test_probes(client):
+    assert client.get("/healthz").json() == {"status": "ok"}
+    assert client.get("/readyz").json() == {"status": "ready"}
+
+
+def test_app_serves_requests_after_a_second_lifespan_cycle(client):
+    # Dois ciclos completos de startup/shutdown no mesmo processo (vários
+    # TestClient, reload): o shutdown do primeiro não pode deixar o pool de
+    # hashing desligado para o segundo
+    try:
+        with TestClient(app):
+            pass
+        with TestClient(app) as second:
+            assert second.get("/readyz").status_code == 200
+            user = {"username": "lifespan", "email": "lifespan@test.com"}
+            response = second.post("/users/", json={**user, "password": PASSWORD})
+            assert response.status_code == 201, response.text
+            response = second.post(
+                "/auth/token", data={"username": user["email"], "password": PASSWORD}
+            )
+            assert response.status_code == 200, response.text
+    finally:
+        # O lifespan do `client` da sessão continua aberto
+        app.state.ready = True
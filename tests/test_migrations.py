@@ -0,0 +1,41 @@
+import sqlite3
+import subprocess
+import sys
+
+from sqlalchemy.dialects import postgresql
+
+from core.database import add_column_ddl
+from models import User
+
+
+def test_add_column_quotes_reserved_table_names():
+    column = User.__table__.c.post_count
+    ddl = add_column_ddl(column, postgresql.dialect())
+    assert ddl.startswith('ALTER TABLE "user" ADD COLUMN post_count INTEGER')
+
+
+def test_migration_adds_post_count_to_an_old_database(tmp_path, monkeypatch):
+    path = tmp_path / "old.db"
+    with sqlite3.connect(path) as conn:
+        # Schema de antes do contador desnormalizado
+        conn.executescript(
+            """
+            CREATE TABLE user (
+                id INTEGER PRIMARY KEY, username VARCHAR NOT NULL,
+                email VARCHAR NOT NULL, password VARCHAR NOT NULL
+            );
+            INSERT INTO user VALUES (1, 'a', 'a@test.com', 'x');
+            """
+        )
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{path}")
+    result = subprocess.run(
+        [sys.executable, "-m", "core.server", "--migrate-only"],
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT post_count FROM user").fetchall() == [(0,)]
@@ -0,0 +1,82 @@
+import pytest
+
+from core.config import settings
+
+
+@pytest.mark.parametrize("limit", [0, -1, 101])
+def test_list_posts_rejects_invalid_limit(client, limit):
+    response = client.get("/posts/", params={"limit": limit})
+    assert response.status_code == 400
+
+
+def test_list_posts_pages_by_cursor(client, make_user, make_post):
+    author, _ = make_user()
+    created = [make_post(author["id"], title=f"Post {i}")["id"] for i in range(3)]
+
+    first = client.get("/posts/", params={"author_id": author["id"], "limit": 2})
+    assert [item["id"] for item in first.json()["items"]] == created[:0:-1]
+
+    second = client.get(
+        "/posts/",
+        params={
+            "author_id": author["id"],
+            "limit": 2,
+            "cursor": first.json()["next_cursor"],
+        },
+    )
+    assert [item["id"] for item in second.json()["items"]] == created[:1]
+    assert second.json()["next_cursor"] is None
+
+
+def test_search_snippet_escapes_post_content(client, make_user, make_post):
+    author, _ = make_user()
+    make_post(
+        author["id"],
+        title="Marcação",
+        content='texto <script>alert("xss")</script> com palavrarara no meio',
+    )
+
+    response = client.get("/posts/", params={"search": "palavrarara"})
+    snippet = response.json()["items"][0]["snippet"]
+    assert "<script>" not in snippet
+    assert "&lt;script&gt;" in snippet
+    assert "<mark>palavrarara</mark>" in snippet
+
+
+def test_bulk_update_rejects_null_fields(client, make_user, make_post):
+    author, headers = make_user()
+    first = make_post(author["id"], title="Original 1")
+    second = make_post(author["id"], title="Original 2")
+
+    response = client.patch(
+        "/posts/bulk",
+        json=[{"id": first["id"], "title": "ok"}, {"id": second["id"], "title": None}],
+        headers=headers,
+    )
+    assert response.status_code == 422
+    assert client.get(f"/posts/{first['id']}").json()["title"] == "Original 1"
+
+    response = client.patch(
+        "/posts/bulk",
+        json=[{"id": first["id"], "title": "ok"}, {"id": second["id"]}],
+        headers=headers,
+    )
+    assert [item["status"] for item in response.json()] == [200, 200]
+    assert client.get(f"/posts/{first['id']}").json()["title"] == "ok"
+    assert client.get(f"/posts/{second['id']}").json()["title"] == "Original 2"
+
+
+def test_bulk_create_stops_reading_past_the_limit(client, make_user, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_MAX_ITEMS", 3)
+    author, _ = make_user()
+    lines = [
+        f'{{"title": "t{i}", "content": "c", "author_id": {author["id"]}}}'
+        for i in range(50)
+    ]
+    response = client.post(
+        "/posts/bulk",
+        content="\n".join(lines),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert [item["status"] for item in response.json()] == [201, 201, 201, 413]
+    assert response.json()[-1]["index"] == 3
@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+from fastapi import Response
+
+from core import profiling
+from core.config import settings
+
+
+@pytest.mark.anyio
+async def test_concurrent_profiles_are_rejected(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+    release = asyncio.Event()
+
+    async def slow_call_next(request):
+        await release.wait()
+        return Response(b"ok")
+
+    class FakeRequest:
+        method = "GET"
+
+        class url:
+            path = "/posts/"
+
+    first = asyncio.ensure_future(
+        profiling.profile_request(FakeRequest(), slow_call_next)
+    )
+    await asyncio.sleep(0)
+    second = await profiling.profile_request(FakeRequest(), slow_call_next)
+    assert second.status_code == 409
+
+    release.set()
+    response = await first
+    assert response.status_code == 200
+    assert response.headers["X-Profile-File"].startswith(str(tmp_path))
+
+    # Terminado o primeiro, um novo profiling é aceito
+    third = await profiling.profile_request(FakeRequest(), slow_call_next)
+    assert third.status_code == 200
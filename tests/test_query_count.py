@@ -0,0 +1,69 @@
+"""
+Regressão de N+1: o número de statements de uma página não pode depender
+do tamanho da página (autores vêm no mesmo SELECT dos posts).
+"""
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from core.database import async_engine
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before)
+
+
+@pytest.fixture(scope="module")
+def many_authors_posts(client):
+    # 120 posts de 6 autores diferentes, para que uma página traga vários
+    authors = []
+    for index in range(6):
+        email = f"querycount{index}@test.com"
+        response = client.post(
+            "/users/",
+            json={"username": f"querycount{index}", "email": email, "password": "x"},
+        )
+        authors.append(response.json()["id"])
+    posts = [
+        {
+            "title": f"Consulta {index}",
+            "content": "contagem de statements",
+            "published": True,
+            "author_id": authors[index % len(authors)],
+        }
+        for index in range(120)
+    ]
+    response = client.post("/posts/bulk", json=posts)
+    assert all(item["status"] == 201 for item in response.json())
+
+
+@pytest.mark.parametrize(
+    "params",
+    [{}, {"search": "statements"}, {"fields": "title,author"}],
+    ids=["list", "search", "fields"],
+)
+def test_page_query_count_does_not_grow_with_limit(
+    client, many_authors_posts, params
+):
+    counts = {}
+    for limit in (1, 100):
+        with count_statements() as statements:
+            response = client.get("/posts/", params={**params, "limit": limit})
+        assert response.status_code == 200
+        assert len(response.json()["items"]) == limit
+        counts[limit] = len(statements)
+
+    assert counts[1] == counts[100]
+    assert counts[1] > 0  # a página veio do banco, não do cache
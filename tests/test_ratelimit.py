@@ -0,0 +1,136 @@
+import asyncio
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from conftest import PASSWORD
+from core.config import settings
+from core.ratelimit import (
+    AdmissionController,
+    MemoryRateLimitBackend,
+    RateLimit,
+    RedisRateLimitBackend,
+    login_failures,
+    rate_limit_backend,
+)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    if request.param == "redis":
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")  # scripts Lua no fakeredis
+        return RedisRateLimitBackend("", client=fakeredis.FakeAsyncRedis())
+    return MemoryRateLimitBackend()
+
+
+@pytest.fixture
+def rate_limited(monkeypatch):
+    """Liga o rate limit com buckets vazios (os testes dividem o backend)."""
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(rate_limit_backend, "_buckets", OrderedDict())
+    monkeypatch.setattr(login_failures, "backend", MemoryRateLimitBackend())
+
+
+@pytest.mark.anyio
+async def test_bucket_allows_burst_then_asks_to_wait(backend):
+    for _ in range(3):
+        assert await backend.consume("key", rate=1, burst=3) == 0
+    assert await backend.consume("key", rate=1, burst=3) > 0
+
+
+@pytest.mark.anyio
+async def test_peek_does_not_take_a_token(backend):
+    for _ in range(5):
+        assert await backend.peek("key", rate=1, burst=1) == 0
+    assert await backend.consume("key", rate=1, burst=1) == 0
+    assert await backend.peek("key", rate=1, burst=1) > 0
+
+
+@pytest.mark.anyio
+async def test_rate_limit_rejects_with_retry_after(rate_limited):
+    limit = RateLimit("test_ip", "2/minute", backend=MemoryRateLimitBackend())
+    request = Request({"type": "http", "client": ("10.0.0.1", 1234), "headers": []})
+
+    await limit(request)
+    await limit(request)
+    with pytest.raises(HTTPException) as rejected:
+        await limit(request)
+    assert rejected.value.status_code == 429
+    assert int(rejected.value.headers["Retry-After"]) >= 1
+
+
+@pytest.mark.anyio
+async def test_admission_queue_full_and_timeout():
+    controller = AdmissionController(
+        "test", max_concurrency=1, max_queue=1, queue_timeout=0.05
+    )
+    admit = asynccontextmanager(controller.__call__)
+
+    async with admit():
+        queued = asyncio.create_task(admit().__aenter__())
+        await asyncio.sleep(0)
+        assert controller.waiting == 1
+
+        # Fila cheia: 503 na hora
+        with pytest.raises(HTTPException) as full:
+            async with admit():
+                pass
+        assert full.value.status_code == 503
+        assert full.value.headers["Retry-After"] == "1"
+
+        # A vaga não abriu a tempo: 503 para quem esperava
+        with pytest.raises(HTTPException) as timeout:
+            await queued
+        assert timeout.value.status_code == 503
+
+    assert controller.active == controller.waiting == 0
+
+
+@pytest.mark.anyio
+async def test_admission_hands_the_slot_to_the_queue():
+    controller = AdmissionController(
+        "test_queue", max_concurrency=1, max_queue=1, queue_timeout=1
+    )
+    admit = asynccontextmanager(controller.__call__)
+
+    async def queued():
+        async with admit():
+            return controller.active
+
+    async with admit():
+        task = asyncio.create_task(queued())
+        await asyncio.sleep(0)
+    assert await task == 1
+
+
+def _multipart_login(client, email, password):
+    return client.post(
+        "/auth/token",
+        files={"username": (None, email), "password": (None, password)},
+    )
+
+
+def test_failed_logins_lock_the_account_for_any_form_encoding(
+    client, make_user, rate_limited
+):
+    user, _ = make_user()
+    for _ in range(login_failures.burst):
+        assert _multipart_login(client, user["email"], "errada").status_code == 401
+
+    # No limite: 429 antes da verificação, mesmo com a senha certa
+    response = client.post(
+        "/auth/token", data={"username": user["email"], "password": PASSWORD}
+    )
+    assert response.status_code == 429
+    assert "retry-after" in response.headers
+
+
+def test_successful_logins_do_not_count(client, make_user, rate_limited):
+    user, _ = make_user()
+    for _ in range(login_failures.burst + 5):
+        response = _multipart_login(client, user["email"], PASSWORD)
+        assert response.status_code == 200
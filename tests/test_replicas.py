@@ -0,0 +1,79 @@
+"""
+Read-your-writes com o cache de respostas, sobre dois arquivos SQLite: o
+primário dos testes e uma "réplica" que é uma cópia dele, atualizada só
+quando o teste manda (replicação atrasada).
+"""
+
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from core import database
+from core.cache import response_cache
+from core.config import settings
+from main import app
+
+
+@pytest.fixture
+def catch_up(client, tmp_path, monkeypatch):
+    """Liga uma réplica; chamar o retorno copia o primário para ela."""
+    path = tmp_path / "replica.db"
+
+    def catch_up():
+        primary = make_url(settings.DATABASE_URL).database
+        with sqlite3.connect(primary) as source, sqlite3.connect(path) as target:
+            source.backup(target)
+
+    catch_up()
+    # NullPool: nenhuma conexão fica aberta na réplica entre as cópias
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    event.listen(engine.sync_engine, "connect", database.set_sqlite_pragmas)
+    monkeypatch.setattr(database, "replica_engines", [engine])
+    monkeypatch.setattr(
+        database, "replica_router", database.ReplicaRouter(1, "round_robin", 30)
+    )
+    monkeypatch.setattr(response_cache, "hold_ttl", 30)
+    return catch_up
+
+
+def _title(client, post_id):
+    return client.get(f"/posts/{post_id}").json()["title"]
+
+
+def _titles(client, author_id):
+    response = client.get("/posts/", params={"author_id": author_id})
+    return [item["title"] for item in response.json()["items"]]
+
+
+def test_writer_reads_own_writes_past_the_cache(
+    client, make_user, make_post, catch_up
+):
+    author, headers = make_user()
+    post = make_post(author["id"], title="v1")
+    catch_up()
+    # Clientes próprios: o cookie de read-your-writes fica só no `writer`
+    writer, reader = TestClient(app), TestClient(app)
+    assert _title(reader, post["id"]) == "v1"
+    assert _titles(reader, author["id"]) == ["v1"]
+
+    response = writer.patch(
+        "/posts/bulk", json=[{"id": post["id"], "title": "v2"}], headers=headers
+    )
+    assert response.status_code == 200
+    assert "read_primary" in writer.cookies
+
+    # A réplica ainda não tem a escrita: o leitor vê v1, mas isso não pode
+    # ir para o cache que o escritor (e depois todos) vai consultar
+    assert _title(reader, post["id"]) == "v1"
+    assert _titles(reader, author["id"]) == ["v1"]
+    assert _title(writer, post["id"]) == "v2"
+    assert _titles(writer, author["id"]) == ["v2"]
+
+    catch_up()
+    assert _title(reader, post["id"]) == "v2"
+    assert _titles(reader, author["id"]) == ["v2"]
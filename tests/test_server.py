@@ -0,0 +1,77 @@
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+
+import httpx
+
+from core import server
+from core.config import settings
+
+
+def test_warns_about_memory_cache_with_several_workers(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "memory")
+    assert "CACHE_BACKEND=memory" in server.shared_state_warning(4)
+    assert server.shared_state_warning(1) == ""
+
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "redis")
+    assert server.shared_state_warning(4) == ""
+
+
+def _server_env(tmp_path):
+    return {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{tmp_path / 'server.db'}",
+        "CACHE_BACKEND": "memory",
+    }
+
+
+def test_migrate_only_creates_schema(tmp_path):
+    result = subprocess.run(
+        [sys.executable, "-m", "core.server", "--migrate-only"],
+        env=_server_env(tmp_path),
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "Schema atualizado." in result.stdout
+
+    with sqlite3.connect(tmp_path / "server.db") as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    assert {"user", "post", "post_fts"} <= tables
+
+
+def test_server_starts_workers(tmp_path):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    process = subprocess.Popen(
+        [sys.executable, "-m", "core.server", "--port", str(port), "--workers", "2"],
+        env=_server_env(tmp_path),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        url = f"http://127.0.0.1:{port}"
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                if httpx.get(f"{url}/readyz").status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            assert process.poll() is None, "o servidor terminou antes de subir"
+            assert time.monotonic() < deadline, "o servidor não ficou pronto"
+            time.sleep(0.2)
+        assert httpx.get(f"{url}/healthz").json() == {"status": "ok"}
+        assert httpx.get(f"{url}/posts/").status_code == 200
+    finally:
+        process.terminate()
+        _, stderr = process.communicate(timeout=30)
+
+    assert "CACHE_BACKEND=memory" in stderr
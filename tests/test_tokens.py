@@ -0,0 +1,147 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+import pytest
+
+from core.tokens import (
+    BACKENDS,
+    HMACBackend,
+    InvalidTokenError,
+    MemoryDenylist,
+    RedisDenylist,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture(params=["memory", "redis"])
+def denylist(request):
+    if request.param == "redis":
+        return RedisDenylist("", client=fakeredis.FakeAsyncRedis())
+    return MemoryDenylist()
+
+
+@pytest.mark.anyio
+async def test_add_and_contains(denylist):
+    await denylist.add("jti-1", time.time() + 60)
+    assert await denylist.contains("jti-1")
+    assert not await denylist.contains("jti-2")
+
+
+@pytest.mark.anyio
+async def test_add_if_absent_lets_only_one_caller_win(denylist):
+    expires_at = time.time() + 60
+    results = await asyncio.gather(
+        *(denylist.add_if_absent("jti", expires_at) for _ in range(10))
+    )
+    assert results.count(True) == 1
+    assert await denylist.contains("jti")
+
+
+@pytest.mark.anyio
+async def test_expired_entries_are_not_revoked(denylist):
+    await denylist.add("old", time.time() - 1)
+    assert not await denylist.contains("old")
+
+
+# --- Backends de JWT ---
+
+SECRET = "segredo-de-teste"
+
+
+def _segment(data) -> str:
+    raw = json.dumps(data).encode() if isinstance(data, dict) else data
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _signed(header: dict, claims: dict, algorithm=hashlib.sha256) -> str:
+    signing_input = f"{_segment(header)}.{_segment(claims)}"
+    signature = hmac.new(SECRET.encode(), signing_input.encode(), algorithm)
+    return f"{signing_input}.{_segment(signature.digest())}"
+
+
+@pytest.fixture
+def hs256():
+    return HMACBackend(SECRET, "HS256")
+
+
+def _claims(**extra):
+    return {"sub": "a@test.com", "exp": time.time() + 60, **extra}
+
+
+@pytest.mark.parametrize("name", sorted(BACKENDS))
+def test_backends_read_each_others_tokens(hs256, name):
+    pytest.importorskip({"hmac": "hmac", "pyjwt": "jwt", "jose": "jose"}[name])
+    other = BACKENDS[name](SECRET, "HS256")
+    claims = {"sub": "a@test.com", "exp": int(time.time()) + 60}
+    assert other.decode(hs256.encode(claims)) == claims
+    assert hs256.decode(other.encode(claims)) == claims
+
+
+def test_hmac_rejects_tampering(hs256):
+    token = hs256.encode(_claims())
+    header, payload, signature = token.split(".")
+    forged = _segment(_claims(sub="admin@test.com"))
+    flipped = ("A" if signature[0] != "A" else "B") + signature[1:]
+
+    for bad in (
+        f"{header}.{forged}.{signature}",
+        f"{header}.{payload}.{flipped}",
+        f"{header}.{payload}.",
+        hs256.encode(_claims())[:-2],
+        HMACBackend("outro-segredo", "HS256").encode(_claims()),
+    ):
+        with pytest.raises(InvalidTokenError):
+            hs256.decode(bad)
+
+
+def test_hmac_rejects_other_algorithms(hs256):
+    unsigned = f"{_segment({'alg': 'none', 'typ': 'JWT'})}.{_segment(_claims())}."
+    # Assinado com o segredo certo, mas declarando outro algoritmo
+    hs512 = _signed({"alg": "HS512", "typ": "JWT"}, _claims(), hashlib.sha512)
+    relabeled = _signed({"alg": "HS512", "typ": "JWT"}, _claims())
+
+    other_backend = HMACBackend(SECRET, "HS512").encode(_claims())
+    for bad in (unsigned, hs512, relabeled, other_backend):
+        with pytest.raises(InvalidTokenError):
+            hs256.decode(bad)
+
+
+def test_hmac_checks_exp_and_nbf(hs256):
+    for claims in (
+        _claims(exp=time.time() - 1),
+        _claims(exp="amanhã"),
+        _claims(nbf=time.time() + 60),
+    ):
+        with pytest.raises(InvalidTokenError):
+            hs256.decode(hs256.encode(claims))
+    assert hs256.decode(hs256.encode(_claims(nbf=time.time() - 1)))["sub"]
+
+
+def test_hmac_accepts_only_the_canonical_token(hs256):
+    token = hs256.encode(_claims())
+    header, payload, signature = token.split(".")
+    assert hs256.decode(token)["sub"] == "a@test.com"
+
+    # Última letra com os bits de "sobra" alterados: decodifica igual
+    last = signature[-1]
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    sibling = alphabet[alphabet.index(last) ^ 1]
+
+    for bad in (
+        token + "=",
+        f"{header}.{payload}.{signature}==",
+        f"{header}=.{payload}.{signature}",
+        f"{header}.{payload}.{signature[:-1]}{sibling}",
+        token.replace("-", "+").replace("_", "/"),
+        f"{token}.{signature}",
+        f" {token}",
+    ):
+        if bad == token:
+            continue
+        with pytest.raises(InvalidTokenError):
+            hs256.decode(bad)
@@ -0,0 +1,45 @@
+import pytest
+
+
+@pytest.mark.parametrize("limit", [0, -5, 101])
+def test_list_users_rejects_invalid_limit(client, limit):
+    response = client.get("/users/", params={"limit": limit})
+    assert response.status_code == 400
+
+
+def test_list_users_last_page_has_no_cursor(client, make_user):
+    make_user()
+    cursor, seen = None, []
+    while True:
+        params = {"limit": 1, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/users/", params=params).json()
+        seen += [user["id"] for user in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == sorted(set(seen))
+
+
+def test_user_posts_pages_by_cursor(client, make_user, make_post):
+    author, _ = make_user()
+    created = [make_post(author["id"], title=f"Feed {i}")["id"] for i in range(3)]
+    make_post(author["id"], published=False)
+
+    first = client.get(f"/users/{author['id']}/posts", params={"limit": 2}).json()
+    assert [item["id"] for item in first["items"]] == created[:0:-1]
+
+    second = client.get(
+        f"/users/{author['id']}/posts",
+        params={"limit": 2, "cursor": first["next_cursor"]},
+    ).json()
+    assert [item["id"] for item in second["items"]] == created[:1]
+    assert second["next_cursor"] is None
+
+
+def test_user_posts_of_unknown_user_is_404(client, make_user):
+    assert client.get("/users/999999/posts").status_code == 404
+
+    # Autor existente sem posts: página vazia
+    author, _ = make_user()
+    response = client.get(f"/users/{author['id']}/posts")
+    assert response.json() == {"items": [], "next_cursor": None}
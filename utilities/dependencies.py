@@ -1,19 +1,61 @@
+from typing import Optional, Tuple
+
 from fastapi import Depends, HTTPException
-from sqlmodel import Session, select
+from sqlalchemy import event, inspect
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from core.database import get_session
-from core.security import get_current_user_email
+from core.cache import TTLCache
+from core.config import settings
+from core.database import get_async_session
+from core.security import get_current_user_email, token_cache
 from models import User
+from utilities.serialization import parse_post_fields
+
+# Usuários autenticados recentemente: email -> colunas do User
+user_cache = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def invalidate_cached_user(mapper, connection, target: User):
+    """
+    Remove o usuário do cache quando ele é alterado ou apagado (inclusive o
+    email antigo, caso o email tenha mudado).
+    """
+    old_emails = inspect(target).attrs.email.history.deleted or ()
+    for email in (target.email, *old_emails):
+        user_cache.delete(email)
+
+
+def auth_cache_stats() -> dict:
+    """
+    Contadores de acerto/erro dos caches de autenticação.
+    """
+    return {"tokens": token_cache.stats(), "users": user_cache.stats()}
 
 
 def check_max_limit(limit: int = 10):
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="O limite mínimo é 1.")
     if limit > 100:
         raise HTTPException(
-            status_code=400, detail="O limite máximo permitido para posts é 100."
+            status_code=400, detail="O limite máximo permitido é 100."
         )
     return limit
 
 
+def get_post_fields(fields: Optional[str] = None) -> Optional[Tuple[str, ...]]:
+    """
+    Campos pedidos em `fields=` (ex.: "title,excerpt,author"); None para a
+    representação completa.
+    """
+    try:
+        return parse_post_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
 def get_current_user(user_id: int = 1):
     return {"user_id": user_id, "username": "admin_simulado"}
 
@@ -27,19 +69,30 @@ def ckeck_admin_permission(current_user: dict = Depends(get_current_user)):
     return current_user
 
 
-def get_current_active_user(
+async def get_current_active_user(
     current_user_email: str = Depends(get_current_user_email),
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
 ) -> User:
     """
     Dependência que verifica o token, busca o usuário no DB e garante que ele existe.
     Retorna o objeto User completo.
     """
+    # Usuário resolvido recentemente: dispensa a ida ao DB
+    cached = user_cache.get(current_user_email)
+    if cached is not None:
+        return User(**cached)
+
     # Buscamos o usuário no DB pelo email que veio do token
-    user = db.exec(select(User).where(User.email == current_user_email)).first()
+    user = (
+        await db.exec(select(User).where(User.email == current_user_email))
+    ).first()
 
     if not user:
         raise HTTPException(status_code=404, detail="Usuário não encontrado.")
 
+    # Guardamos só as colunas: cada requisição recebe um objeto novo, sem
+    # vínculo com a sessão de outra requisição
+    user_cache.set(current_user_email, user.model_dump())
+
     # Poderíamos checar aqui se o usuário está ativo, se tivéssemos o campo 'is_active'
     return user
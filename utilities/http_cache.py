@@ -0,0 +1,92 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, Optional
+
+from fastapi import Request, Response, status
+
+from core.cache import CachedResponse
+from core.config import settings
+
+
+def make_etag(*parts) -> str:
+    """
+    ETag fraco a partir das versões dos recursos (ids, updated_at...),
+    calculado sem precisar serializar o corpo da resposta.
+    """
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    # O SQLite devolve datas sem fuso; elas são sempre gravadas em UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _http_date(value: datetime) -> str:
+    return format_datetime(_as_utc(value), usegmt=True)
+
+
+def _cache_headers(etag: str, last_modified: Optional[datetime]) -> dict:
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.HTTP_CACHE_MAX_AGE}",
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = _http_date(last_modified)
+    return headers
+
+
+def _is_not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime]
+) -> bool:
+    # If-None-Match tem prioridade sobre If-Modified-Since (RFC 9110)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # Comparação fraca: W/"x" e "x" representam a mesma versão
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            # Datas com "-0000" voltam sem fuso: _as_utc as trata como UTC
+            since = _as_utc(parsedate_to_datetime(if_modified_since))
+        except (TypeError, ValueError):
+            return False
+        return _as_utc(last_modified) <= since
+
+    return False
+
+
+def cached_json_response(request: Request, entry: CachedResponse) -> Response:
+    """
+    Resposta a partir de uma entrada do cache: 304 se o cliente já tem a
+    versão, senão os bytes guardados, sem nova serialização.
+    """
+    return conditional_json_response(
+        request, entry.etag, lambda: entry.body, entry.last_modified
+    )
+
+
+def conditional_json_response(
+    request: Request,
+    etag: str,
+    build_body: Callable[[], bytes],
+    last_modified: Optional[datetime] = None,
+) -> Response:
+    """
+    Resposta JSON condicional para rotas sem cache de respostas: o ETag vem
+    das versões dos recursos, e `build_body` (a serialização) só roda quando
+    a resposta não é um 304.
+    """
+    headers = _cache_headers(etag, last_modified)
+    if _is_not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(
+        content=build_body(), media_type="application/json", headers=headers
+    )
@@ -0,0 +1,34 @@
+import base64
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(data: Dict[str, Any]) -> str:
+    """
+    Gera um cursor opaco (base64 url-safe) a partir da chave do último item.
+    """
+    raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Decodifica um cursor gerado por `encode_cursor`.
+    Cursores inválidos resultam em 400, nunca em erro interno.
+    """
+    if not cursor:
+        return None
+
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (ValueError, TypeError):
+        data = None
+
+    if not isinstance(data, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido."
+        )
+    return data
@@ -0,0 +1,164 @@
+"""
+Caminho rápido de serialização para as listagens.
+
+Em vez de carregar entidades do ORM e validá-las no Pydantic (PostPublic /
+UserPublic) antes de codificar o JSON, as rotas de leitura selecionam só as
+colunas que a resposta usa e montam os dicionários direto das tuplas, que o
+orjson codifica. O formato é o mesmo dos schemas PostPublic e UserPublic.
+
+Listagens e leituras de posts aceitam `fields=` (sparse fieldsets): só as
+colunas dos campos pedidos entram no SELECT, então uma listagem de títulos
+não lê `content` nem faz o JOIN com o autor. O campo "excerpt" traz só o
+começo do conteúdo, cortado já no SQL.
+"""
+
+from types import SimpleNamespace
+from typing import Any, Optional, Tuple
+
+import orjson
+from sqlalchemy import func
+from sqlmodel import select
+
+from core.config import settings
+from models import Post, User
+
+# Colunas do PostPublic (+ updated_at, usado no ETag)
+POST_PUBLIC_COLUMNS = (
+    Post.id,
+    Post.title,
+    Post.content,
+    Post.published,
+    Post.updated_at,
+    Post.author_id,
+    User.username,
+    User.email,
+)
+
+# Campos aceitos em `fields=`, na ordem em que aparecem na resposta. O id
+# sempre vem: é a chave do cursor e do ETag.
+POST_FIELDS = ("id", "title", "content", "excerpt", "published", "author")
+
+# Um caractere a mais que o resumo: indica se o conteúdo foi cortado
+_excerpt_column = func.substr(Post.content, 1, settings.POST_EXCERPT_LENGTH + 1)
+
+_FIELD_COLUMNS = {
+    "id": (),
+    "title": (Post.title,),
+    "content": (Post.content,),
+    "excerpt": (_excerpt_column.label("excerpt"),),
+    "published": (Post.published,),
+    "author": (Post.author_id, User.username, User.email),
+}
+
+USER_PUBLIC_COLUMNS = (User.id, User.username, User.email, User.post_count)
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content)
+
+
+def parse_post_fields(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    "title,author" -> ("title", "author"), na ordem de POST_FIELDS (a mesma
+    seleção sempre gera a mesma chave de cache). Sem campos: None, que é a
+    representação completa do PostPublic. Campo desconhecido: ValueError.
+    """
+    if value is None:
+        return None
+    requested = {field.strip() for field in value.split(",") if field.strip()}
+    if not requested:
+        return None
+    unknown = requested.difference(POST_FIELDS)
+    if unknown:
+        raise ValueError(f"Campos desconhecidos: {', '.join(sorted(unknown))}.")
+    return tuple(field for field in POST_FIELDS if field in requested)
+
+
+def select_post_rows(*extra_columns, fields: Optional[Tuple[str, ...]] = None):
+    """
+    SELECT das colunas do PostPublic, já com o JOIN do autor. Com `fields`,
+    só as colunas desses campos (+ id e updated_at, usados no ETag), e o
+    JOIN só se o autor foi pedido.
+    """
+    if fields is None:
+        columns = POST_PUBLIC_COLUMNS
+    else:
+        columns = [Post.id, Post.updated_at]
+        for field in fields:
+            columns.extend(_FIELD_COLUMNS[field])
+
+    statement = select(*columns, *extra_columns)
+    if fields is None or "author" in fields:
+        statement = statement.join(User, User.id == Post.author_id)
+    return statement
+
+
+def post_row(post: Post):
+    """Mesma forma das linhas de `select_post_rows` a partir de um Post do ORM."""
+    return SimpleNamespace(
+        id=post.id,
+        title=post.title,
+        content=post.content,
+        published=post.published,
+        updated_at=post.updated_at,
+        author_id=post.author_id,
+        username=post.author.username,
+        email=post.author.email,
+    )
+
+
+def excerpt(text: str) -> str:
+    """
+    Até POST_EXCERPT_LENGTH caracteres, cortados no último espaço e com "…"
+    quando o conteúdo é maior.
+    """
+    limit = settings.POST_EXCERPT_LENGTH
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    head, space, _ = cut.rpartition(" ")
+    return (head if space and head else cut).rstrip() + "…"
+
+
+def _author_payload(row) -> dict:
+    return {"id": row.author_id, "username": row.username, "email": row.email}
+
+
+def post_payload(row, fields: Optional[Tuple[str, ...]] = None) -> dict:
+    if fields is None:
+        return {
+            "id": row.id,
+            "title": row.title,
+            "content": row.content,
+            "published": row.published,
+            "author": _author_payload(row),
+        }
+
+    payload = {"id": row.id}
+    for field in fields:
+        if field == "author":
+            payload["author"] = _author_payload(row)
+        elif field == "excerpt":
+            payload["excerpt"] = excerpt(row.excerpt)
+        elif field != "id":
+            payload[field] = getattr(row, field)
+    return payload
+
+
+def post_version(row, fields: Optional[Tuple[str, ...]] = None) -> tuple:
+    """
+    Tudo que muda a representação de um post: usado para calcular o ETag.
+    Os dados do autor só contam se o autor faz parte da resposta.
+    """
+    if fields is not None and "author" not in fields:
+        return (row.id, row.updated_at)
+    return (row.id, row.updated_at, row.author_id, row.username, row.email)
+
+
+def user_payload(row) -> dict:
+    return {
+        "id": row.id,
+        "username": row.username,
+        "email": row.email,
+        "post_count": row.post_count,
+    }